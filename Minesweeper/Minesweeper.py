@@ -4,363 +4,93 @@ import tkinter as tk
 import random
 import math
 import os
+import sqlite3
 
 from time import time
 from PIL import Image, ImageTk
 from tkinter import messagebox, filedialog
+from board_model import (POKEMON, FLAG, UNEXPOSED, REVEALED,
+                         MAX_GRID_SIZE, LARGE_MAX_GRID_SIZE)
+from engine import PokemonEngine, PLAYING, WON, LOST
+from save_file import BINARY_EXTENSION, write_binary_save, read_binary_save
+from journal import (MoveJournal, recover_journal, REVEAL_MOVE, FLAG_MOVE, CHORD_MOVE,
+                     UNDO_MOVE, REDO_MOVE)
+from leaderboard import Leaderboard, LEADERBOARD_FILE, TEXT_SCORES_FILE
+from probability import ProbabilityEngine
 
 # CONSTANTS
-POKEMON = "☺"
-FLAG = "♥"
-UNEXPOSED = "~"
-EXPOSED = "0"
-UP = "up"
-DOWN = "down"
-LEFT = "left"
-RIGHT = "right"
-DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
-              f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
-              f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
-REVEALED = "0123456789"
 TASK_ONE = 1
 TASK_TWO = 2
-
-class BoardModel(object):
+# games are autosaved here and recovered from here on start up
+AUTOSAVE_DIRECTORY = "autosave"
+# number of moves that can be undone
+UNDO_DEPTH = 100
+
+BOARD_WIDTH = 600
+# boards with cells smaller than this many pixels are too big to give every
+# cell a canvas item - only the cells in view are drawn (see VirtualBoardView)
+MIN_ITEM_CELL_PIXELS = 12
+# cell sizes in pixels a virtual board can be zoomed between
+ZOOM_LEVELS = (MIN_ITEM_CELL_PIXELS, 16, 24, 32, 48, 64)
+# rows and columns drawn beyond each edge of a virtual board's view
+VIEW_MARGIN = 2
+CELL_COLOURS = dict({POKEMON: "yellow", FLAG: "red", UNEXPOSED: "dark green"},
+                    **{number: "light green" for number in REVEALED})
+SPRITES = {
+    POKEMON: ["images/pokemon_sprites/charizard.gif", "images/pokemon_sprites/cyndaquil.gif",
+              "images/pokemon_sprites/pikachu.gif", "images/pokemon_sprites/psyduck.gif",
+              "images/pokemon_sprites/togepi.gif", "images/pokemon_sprites/umbreon.gif"],
+    FLAG: ["images/pokeball.gif"],
+    UNEXPOSED: ["images/unrevealed.gif"],
+    REVEALED: ["images/zero_adjacent.gif", "images/one_adjacent.gif",
+               "images/two_adjacent.gif", "images/three_adjacent.gif",
+               "images/four_adjacent.gif", "images/five_adjacent.gif",
+               "images/six_adjacent.gif", "images/seven_adjacent.gif",
+               "images/eight_adjacent.gif"]
+    }
+HOVER_SPRITE = "images/unrevealed_moved.gif"
+# mouse movement is shown at most once per frame (about 60 frames a second)
+HOVER_DELAY = 16
+
+class TileCache(object):
     """
-    Represents board game involved in game
+    Sprites decoded and resized once for the tile size in use
     """
-    def __init__(self, grid_size, num_pokemon):
-        """
-        It stores and manages internal game state. It is a model class
-
-        Parameters:
-            grid_size (int): the size of the grid used
-            num_pokemon (int): number of hidden pokemon involved
-        """
-        self._grid_size = grid_size
-        self._num_pokemon = num_pokemon
-        self._game = UNEXPOSED * grid_size*grid_size
-        self._pokemon_locations = self.generate_pokemons(grid_size, num_pokemon)
-        
-    def get_pokemon_locations(self):
-        """
-        (list<int>) Returns indices of pokemon locations in game string
-        """
-        return self._pokemon_locations
-
-    def get_num_attempted_catches(self):
-        """
-        (int) Returns number of pokeballs currently placed on board
-        """
-        pokeballs_num = 0
-        for element in self.get_game():
-            if element == FLAG:
-                pokeballs_num+=1
-        return pokeballs_num
-
-    def get_num_pokemon(self):
-        """
-        (int) Returns number of pokemons hidden in game
-        """
-        return self._num_pokemon
-
-    def get_game(self):
-        """
-        (str) Returns the status of game string that represents each tile on game
-        board
-        """
-        return self._game
-
-    def check_loss(self):
-        """
-        (bool) Returns True if and only if game is lost, else will be False
-        """
-        pokemon_hidden_loc = self.get_pokemon_locations()
-        pokemon_pos = []
-        
-        for pokemon_index in pokemon_hidden_loc:
-            pokemon_pos.append(self.index_to_position(pokemon_index))
-
-        for index, element in enumerate(self._game):
-            pos = self.index_to_position(index)
-
-            if pos in pokemon_pos and element in REVEALED:
-                return True
-        return False
-
-    def check_win(self):
-        """
-        (bool) Checks if player has won game by looking into all cell status of game string
-
-        """
-        non_pokemon_cell = len(self._game) - len(self._pokemon_locations)
-        cond1 = 0
-        cond2 = 0
-        for cell in self._game:
-            if cell.isdigit():
-                cond1 += 1
-        for pokemon in self._pokemon_locations:
-            if self._game[pokemon] == FLAG:
-                cond2 += 1
-        if cond1 == non_pokemon_cell and cond2 == len(self._pokemon_locations):
-            return True
-        else:
-            return False
-        
-    def index_to_position(self, index):
-        """
-        (tuple<int, int>) Returns (row, col) coordinate corresponding to supplied index
-
-        Paramters:
-            index (int): index corresponding to game string
-        """
-        row = index // self._grid_size
-        col = index % self._grid_size
-        coordinate = (row, col)
-        return coordinate
-
-    def position_to_index(self, position):
-        """
-        (int) Returns index corresponding to coordinate inputted
-
-        Paramters:
-            positio (tuple): tuple corresponding to position of tile on game board
-        """
-        index = position[1] + position[0]*self._grid_size
-        return index
-
-    def replace_character_at_index(self, index, character):
-        """
-        Replaces game string with specified character placed at the specified index
-        anad returns it
-
-        Parameters:
-            game (str): A string of all relevant game character 
-            index (int): The index position in game string that will be updated
-            character (str): The character that will be used to update a specific game string
-        """
-        game = list(self._game)
-        game[index] = character
-        self._game = "".join(game)
-
-    def flag_cell(self, index):
-        """
-        Toggles the flag at the specified index in game string and updates it
-
-        Parameters:
-            game (string): A string of all relevant game character 
-            index (int): The index position in game string that will be updated 
-        """
-        game = list(self._game)
-        if game[index] == UNEXPOSED:
-            game[index] = FLAG
-        elif game[index] == FLAG:
-            game[index] = UNEXPOSED
-        self._game = "".join(game) 
-
-    def generate_pokemons(self, grid_size, number_of_pokemons):
-        """
-        (tuple<int>) Pokemons will be generated and given a random index within the
-        game. 
-
-        Parameters:
-            grid_size (int): The grid size of the game.
-            number_of_pokemons (int): The number of pokemons that the game will
-            have.
-        """
-        cell_count = grid_size ** 2
-        pokemon_locations = ()
-
-        for _ in range(number_of_pokemons):
-            if len(pokemon_locations) >= cell_count:
-                break
-            index = random.randint(0, cell_count-1)
-
-            while index in pokemon_locations:
-                index = random.randint(0, cell_count-1)
-
-            pokemon_locations += (index,)
-        return pokemon_locations
-            
-    def index_in_direction(self, index, grid_size, direction):
-        """
-        (int) Takes index to a cell in the game string and returns a new index
-        corresponding to an adjacent cell in the specified direction and will
-        return None if it goes out of game board boundaries
-
-        Parameters:
-            index (int): The index position in game string that is relevant for specified direction
-            grid_size (int): Grid size of the game
-            direction (str): Direction of intended movement
-        """
-        directions_dict = {
-        UP : -1,
-        DOWN: 1,
-        LEFT: -1,
-        RIGHT: 1,
-        UP+'-'+LEFT: [-1,-1],
-        UP+'-'+RIGHT: [1,-1],
-        DOWN+'-'+LEFT: [-1,1],
-        DOWN+'-'+RIGHT: [1,1]
-        }
-
-        topL_corner = 0
-        topR_corner = grid_size-1
-        botL_corner = grid_size*(grid_size-1)
-        botR_corner = grid_size*grid_size
-        
-        top_boundary = [i for i in range(topL_corner ,topR_corner+1)]
-        bot_boundary = [i for i in range(botL_corner , botR_corner+1)]
-        left_boundary = [i for i in range(topL_corner, botL_corner+1, grid_size)]
-        right_boundary = [i for i in range(topR_corner, botR_corner, grid_size)]
-
-        # Code at the bottom ensures indexes on the edges of the grid would not be updated when it is directed towards the boundaries of the grid
-        # and will return None instead. All indexes on the edges of grid are covered in the code below
-        if direction in [RIGHT, LEFT]:
-            if (index in left_boundary and direction == LEFT) or (index in right_boundary and direction == RIGHT):
-                return None
-            index = index + directions_dict[direction]
-            
-        elif direction in [UP, DOWN]:
-            if (index in top_boundary and direction == UP) or (index in bot_boundary and direction == DOWN):
-                return None
-            index = index + grid_size*directions_dict[direction]
-            
-        elif direction in directions_dict:
-            if direction in [UP+'-'+LEFT, DOWN+'-'+LEFT]:
-                if (index in (top_boundary + left_boundary) and direction == UP+'-'+LEFT) or (index in (left_boundary + bot_boundary) and direction == DOWN+'-'+LEFT):
-                    return None
-                
-            elif direction in [UP+'-'+RIGHT, DOWN+'-'+RIGHT]:
-                if (index in (top_boundary + right_boundary) and direction == UP+'-'+RIGHT) or (index in (right_boundary + bot_boundary) and direction == DOWN+'-'+RIGHT):
-                    return None
-            index = index + directions_dict[direction][0] + grid_size*directions_dict[direction][1]
-            
-        else:
-            return None
-        return index
-
-    def neighbour_directions(self, index, grid_size):
+    def __init__(self):
         """
-        (list<int>) Returns a list of indexes that have a neighbouring cell
-        (excluding the boundaries).
-
-        Parameters:
-            index (int): The index position in game string 
-            grid_size (int): Grid size of the game
+        Keeps one PhotoImage per (sprite path, tile size) that every cell
+        showing the sprite shares. Tiles of the old size are thrown away once
+        tiles of a new size are asked for, so only one board width is cached
         """
-        neighbour_indexes = []
-        for direct in DIRECTIONS:
-            if self.index_in_direction(index, grid_size, direct) != None:
-                neighbour_indexes.append(self.index_in_direction(index, grid_size, direct))
-        return neighbour_indexes
+        self._tiles = {}
+        self._size = None
 
-    def number_at_cell(self, game, pokemon_locations, grid_size, index):
+    def get_tile(self, path, size):
         """
-        (int) Would check the number of pokemon in neighbouring cells and output an
-        integer of that particular cell
-
-        Parameters:
-            game (str): Used to check if there are already any exposed cell in game string
-            grid_size (int): Grid size of the game
-            index (int): This would be the relevant cell that will be checked to see number of pokemon around it
-            pokemon_locations (tuple <int,...>): Random pokemon locations which is given as index number corresponding to position in game string
-        """
-        pokemon_num = 0
-        revealed = "012345678"
-        revealed_cell = []
-        neighbours = self.neighbour_directions(index, grid_size)
-
-        # bottom code appends revealed cell (cells that are not "~") to an empty list
-        for cell in neighbours:
-            if game[cell] in revealed:
-                revealed_cell.append(cell)
-
-        # since neighbour_directions would include a revealed cell as a "neighbour",
-        # it is unnecessary and since there will be 10x10 cells, this removal of
-        # cells that are not relevant would speed code up
-        for cell in revealed_cell:
-            if cell in neighbours:
-                neighbours.remove(cell)
-
-        for cell in neighbours:
-            if cell in pokemon_locations:
-                pokemon_num+=1   
-        return pokemon_num
-
-    def big_fun_search(self, game , grid_size, pokemon_locations, index):
-        """
-        (list<int>) Searching adjacent cells to see if there are any Pokemon"s
-        present. Find all cells which should be revealed when a cell is selected.
-        For cells which have a zero value (i.e. no neighbouring pokemons) all the
-        cell"s neighbours are revealed. If one of the neighbouring cells is also
-        zero then all of that cell"s neighbours are also revealed. This repeats
-        until no zero value neighbours exist.
-        For cells which have a non-zero value (i.e. cells with neightbour pokemons)
-        , only the cell itself is revealed.
+        (ImageTk.PhotoImage) Returns sprite at path resized to a square tile
 
         Parameters:
-            game (str): Game string.
-            grid_size (int): Size of game.
-            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
-            index (int): Index of the currently selected cell
+            path (str): path of sprite image
+            size (int): width and height of tile in pixels
         """
-        queue = [index]
-        discovered = [index]
-        visible = []
+        if size != self._size:
+            self._tiles.clear()
+            self._size = size
+        tile = self._tiles.get(path)
+        if tile is None:
+            tile = ImageTk.PhotoImage(Image.open(path).resize((size, size)))
+            self._tiles[path] = tile
+        return tile
 
-        if game[index] == FLAG:
-                return queue
-
-        number = self.number_at_cell(game, pokemon_locations, grid_size, index)
-        if number != 0:
-                return queue
-
-        while queue:
-            node = queue.pop()
-            for neighbour in self.neighbour_directions(node, grid_size):
-                if neighbour in discovered or neighbour is None:
-                    continue
-
-                discovered.append(neighbour)
-                if game[neighbour] != FLAG:
-                    number = self.number_at_cell(game, pokemon_locations, grid_size, neighbour)
-                    if number == 0:
-                        queue.append(neighbour)
-                visible.append(neighbour)
-        return visible
-
-    def restart_game_string(self):
+    def clear(self):
         """
-        (int) This will restart all elements in game string but maintain hidden
-        pokemon locations
+        Forgets every cached tile
         """
-        self._game = UNEXPOSED * self._grid_size*self._grid_size
+        self._tiles.clear()
+        self._size = None
 
-    def get_num_pokeball_left(self):
-        """
-        Acquires the number of pokeballs left for players
-        """
-        pokeballs_num = self.get_num_pokemon()
-        for element in self.get_game():
-            if element == FLAG:
-                pokeballs_num-=1
-        return pokeballs_num
-
-    def set_game_settings_open(self, pokemon_num, pokemon_loc, game_string, grid_size):
-        """
-        This will ensure the following settings would follow settings of file loaded:
-        number of pokemons in game, pokemon location and game string
-
-        Parameters:
-            pokemon_num (int): Previous game data's of number of pokemons
-            pokemon_loc (tuple): Previous game data's of location of pokemons
-            game_string (str): Previous game data's of game string
-        """
-        self._game = game_string
-        self._num_pokemon = pokemon_num
-        self._pokemon_locations = pokemon_loc
-        self._grid_size = grid_size
+# shared by every image board view so redraws reuse the tiles of the last view
+TILE_CACHE = TileCache()
 
 class StatusBar(tk.Frame):
     """
@@ -508,7 +238,8 @@ class PokemonGame(object):
     """
     Represents the entire game process
     """
-    def __init__(self, master, grid_size=10, num_pokemon=3, task=TASK_TWO):
+    def __init__(self, master, grid_size=10, num_pokemon=3, task=TASK_TWO, large_board=False,
+                 safe_first_click=False, journal_directory=None):
         """
         Interaction between game model and view. It is a controller class
 
@@ -517,23 +248,34 @@ class PokemonGame(object):
             num_pokemon (int): number of hidden pokemon involved
             master (object): tkinter.Tk class used to represent 'master' window
             task (int): indication of different PokemonGame versions used
+            large_board (bool): allows grid sizes of up to LARGE_MAX_GRID_SIZE
+            safe_first_click (bool): first cell revealed in each game never has
+            a pokemon in or around it
+            journal_directory (str): directory every move of TASK_TWO games is
+            autosaved to - a game left there by the last run is carried on
         """
         self._grid_size = grid_size
         self._master = master
         self._board_view = None
         self._num_pokemon = num_pokemon
+        self._large_board = large_board
+        self._max_grid_size = LARGE_MAX_GRID_SIZE if large_board else MAX_GRID_SIZE
 
-        if not 1 < self._grid_size < 11:
+        if not 1 < self._grid_size <= self._max_grid_size:
             tk.messagebox.showerror(title="Grid_size invalid value",
-                                                message="Grid_size must have a value of anything between or inclusive of 2 to 10")
+                                                message="Grid_size must have a value of anything between or inclusive of 2 to " + str(self._max_grid_size))
             exit()
         if not -1 < self._num_pokemon < self._grid_size**2:
             tk.messagebox.showerror(title="Pokemon num invalid value",
                                                 message="Pokemon number must have a value of anything between or inclusive of 0 to grid_size^2")
             exit()
-        self._model = BoardModel(grid_size, num_pokemon)
-        self._pokeball_left = self._model.get_num_pokeball_left()
         self._task = task
+        # game rules are played by the headless engine - this class only shows
+        # them and passes clicks and menu choices on
+        self._engine = PokemonEngine(grid_size, num_pokemon, limit_pokeballs=task == TASK_TWO,
+                                     safe_first_click=safe_first_click,
+                                     history_depth=UNDO_DEPTH if task == TASK_TWO else 0)
+        self._journal = None
 
         self._master.geometry("{}x{}".format(700, 700))
         self._master.title("Pokemon: Got 2 Find Them All!")
@@ -543,11 +285,8 @@ class PokemonGame(object):
         top_label.pack(fill='x', pady=(0,1))
 
         if self._task == TASK_TWO:
-            # the variables below are used to reorganise the high score board
-            # involves reshuffling and deleton of scores that were lower compared
-            # to the new incoming scores in high_score_save_file method
-            self._high_score_data = {}
-            self._temp_score_data = {}
+            self._leaderboard = None
+            self._probability_engine = ProbabilityEngine()
             self._high_score_exist = None
 
             # variables below are stored and shared among methods below
@@ -564,7 +303,7 @@ class PokemonGame(object):
             menubar = tk.Menu(self._master)
             self._master.config(menu=menubar)
 
-            # ensures high score file exists
+            # ensures leaderboard exists
             self.high_score_file()
 
             # within menu bar create file menu
@@ -578,28 +317,94 @@ class PokemonGame(object):
             filemenu.add_command(label="New game", command=self.new_game)
             filemenu.add_command(label="Quit", command=self.quit_game)
             filemenu.add_command(label="High Score", command=self.draw_high_score_window)
+
+            editmenu = tk.Menu(menubar, tearoff=False)
+            menubar.add_cascade(label="Edit", menu=editmenu)
+            editmenu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo_move)
+            editmenu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo_move)
+            editmenu.add_command(label="Hint", accelerator="Ctrl+H", command=self.show_hint)
+            self._master.bind("<Control-z>", lambda event: self.undo_move())
+            self._master.bind("<Control-y>", lambda event: self.redo_move())
+            self._master.bind("<Control-h>", lambda event: self.show_hint())
             self._timer_on = True
             
             self._status_bar = StatusBar(self._master, self.new_game, self.restart_game)
             self._master.after(0, self._status_bar.update_start_time())
+
+            if journal_directory is not None:
+                recovered = recover_journal(journal_directory)
+                self._journal = MoveJournal(journal_directory, self.journal_snapshot)
+                if recovered is not None:
+                    self.recover_game(recovered)
         self.draw()
+        # the clock has only started (from any recovered time) once board is
+        # drawn, so the first snapshot waits until then
+        if self._journal is not None:
+            self._journal.compact()
+
+    def journal_snapshot(self):
+        """
+        (tuple) Returns a copy of game for the journal to write as a snapshot
+        """
+        model = self._engine.get_model()
+        if self._board_view is not None:
+            board_width = self._board_view.get_board_width()
+        else:
+            board_width = self._board_width_loaded or BOARD_WIDTH
+        return (model.get_grid_size(), model.get_pokemon_locations(), model.get_cell_codes(),
+                self._status_bar.get_elapsed_time() or 0, board_width)
+
+    def recover_game(self, recovered):
+        """
+        Carries on the game left in the journal by the last run - its last
+        snapshot is loaded and the moves made since are played again. Games
+        that no longer fit the grid size limit are left behind
+
+        Parameters:
+            recovered (dict): game given by recover_journal
+        """
+        grid_size = recovered["Grid_size"]
+        if not 2 <= grid_size <= self._max_grid_size:
+            return
+        pokemon_loc = recovered["Pokemon_locations"]
+        # snapshots taken before a safe first click placed pokemons have none -
+        # nothing was revealed yet so there is no game to carry on
+        if not pokemon_loc:
+            return
+        # moves are played again on an engine of their own so a game that
+        # turns out to be finished leaves the game shown untouched
+        engine = PokemonEngine(grid_size, 0, limit_pokeballs=self._engine.get_limit_pokeballs(),
+                               safe_first_click=self._engine.get_safe_first_click(),
+                               history_depth=UNDO_DEPTH)
+        engine.load_game(len(pokemon_loc), pokemon_loc, recovered["Game_string"], grid_size)
+        for move, index, _ in recovered["Moves"]:
+            if move == REVEAL_MOVE:
+                engine.reveal(index)
+            elif move == CHORD_MOVE:
+                engine.chord(index)
+            elif move == UNDO_MOVE:
+                engine.undo()
+            elif move == REDO_MOVE:
+                engine.redo()
+            else:
+                engine.flag(index)
+        if engine.status()["state"] != PLAYING:
+            return
+        self._engine = engine
+        self._grid_size = grid_size
+        self._num_pokemon = len(pokemon_loc)
+        self._board_width_loaded = recovered["Board_width"]
+        self._status_bar.set_elapsed_time(recovered["Elapsed_time"])
         
     def high_score_save_file(self,time,name):
         """
-        Saves high score data of player who won game while beating other players
-        to be the top 3 or top 1 if file doesn't exist
+        Saves winning time of player to the leaderboard of the game settings
+        if it beats the times already there
 
         Parameters:
             time (str): Time spent by player before completing game
             name (str): Name of player
         """
-        filename = "Highscore_data_A3.txt"
-        # this is a  temp dictionary with names as keys and values with
-        # seconds integers
-        temp_dict_scores = {}
-        # this is a temp dictionary with names as keys and values with
-        # 1m 20s string
-        temp_dict_real_time = {}
         reformat_time_str = time.replace('m','').replace('s','').rstrip().split(' ')
         new_score = int(reformat_time_str[0])*60 + int(reformat_time_str[1])
 
@@ -607,99 +412,29 @@ class PokemonGame(object):
             tk.messagebox.showerror(title="Input Name please", message="Please input a name")
             self.congrats_box(time)
             self._master.wait_window(self._congrats_box)
-            name_of_winner = self._winner_name.get()
-            if name_of_winner == "":
+            name = self._winner_name.get()
+            if name == "":
                 tk.messagebox.showerror(title="Nameless", message="Without a name - no record will be saved")
                 return None
-                
-        if self._temp_score_data == {}:
-            temp_dict_scores[name] = new_score
-            temp_dict_real_time[name] = time 
-        elif name in self._temp_score_data and new_score < self._temp_score_data[name]:
-            temp_dict_scores[name] = new_score
-            temp_dict_real_time[name] = time
-        elif name in self._temp_score_data:
-            pass
-        else:
-            count = 0
-            for (player_name, before_scores), (_, before_time) in zip(self._temp_score_data.items(), self._high_score_data.items()):
-                if len(self._temp_score_data) < 3:
-                    if name not in temp_dict_scores:
-                        temp_dict_scores[name] = new_score
-                        temp_dict_real_time[name] = time
-                    temp_dict_scores[player_name] = before_scores
-                    temp_dict_real_time[player_name] = before_time
-                else:
-                    # if self._temp_score_data has 3 entries of high scores already
-                    # it starts to get rid of old high scores and only keep the top 3
-                    if count >= 3:
-                        continue
-                    elif new_score < before_scores and count < 2:
-                        temp_dict_scores[name] = new_score
-                        temp_dict_scores[player_name] = before_scores
-                        temp_dict_real_time[name] = time
-                        temp_dict_real_time[player_name] = before_time
-                        count+=2
-                    elif new_score == before_scores and count < 2:
-                        temp_dict_scores[player_name] = before_scores
-                        temp_dict_scores[name] = new_score
-                        temp_dict_real_time[player_name] = before_time
-                        temp_dict_real_time[name] = time
-                        count+=2
-                    elif count < 3:
-                        temp_dict_scores[player_name] = before_scores
-                        temp_dict_real_time[player_name] = before_time
-                        count+=1
-
-        self._high_score_data = {}
-        self._temp_score_data = {}
-        # below will only have 3 keys and values which indicates top 3 players
-        for key in sorted(temp_dict_scores, key=temp_dict_scores.get, reverse=False):
-            self._temp_score_data[key] = temp_dict_scores[key]
-            self._high_score_data[key] = temp_dict_real_time[key]
-                
-        if self._temp_score_data:
-            with open(filename, 'w') as file:
-                for player_name, time in self._high_score_data.items():
-                    file.write("%s: %s\n" % (player_name, time))
-            
+
+        model = self._engine.get_model()
+        try:
+            self._leaderboard.add_score(name, model.get_grid_size(),
+                                        model.get_num_pokemon(), new_score)
+        except sqlite3.Error as error:
+            tk.messagebox.showerror(title="High score not saved",
+                                    message="High score could not be saved: " + str(error))
+
     def high_score_file(self):
         """
-        Creates or updates data on high score of users
+        Opens leaderboard, creating it if it doesn't exist. Scores of the old
+        high score text file are moved into a new leaderboard under the
+        settings of this game
         """
-        filename = "Highscore_data_A3.txt"
-        # this is a dictionary with names as keys and values with seconds integers
-        self._temp_score_data = {}
-        store_score_data = {}
-        # this is a dictionary with names as keys and values with 1m 20s string
-        self._high_score_data = {}
-        
-        if os.path.isfile(filename):
-            with open(filename, 'r') as file:
-                file_data = file.readlines()
-
-                for index, line in enumerate (file_data):
-                    temp_minute = []
-                    reformat_line = line.split(':')
-                    # will be used to be displayed on top level window
-                    total_time_str = reformat_line[1].rstrip()
-                    # will be easier to sort highscores like this 
-                    total_time_num = reformat_line[1].replace('m','').replace('s','').rstrip().split()
-
-                    # converts string numbers to integers
-                    for element in total_time_num:
-                        temp_minute.append(int(element))
-
-                    self._temp_score_data[reformat_line[0]] = temp_minute[0]*60 + temp_minute[1]
-                    store_score_data[reformat_line[0]] = total_time_str
-
-            # sort values from shortest time to longest
-            for key in sorted(self._temp_score_data, key=self._temp_score_data.get, reverse=False):
-                self._high_score_data[key] = store_score_data[key]
-                
-        else:
-            # create file if file doesn't exist
-            open(filename, 'w')
+        self._leaderboard = Leaderboard(LEADERBOARD_FILE)
+        if self._leaderboard.is_empty() and os.path.isfile(TEXT_SCORES_FILE):
+            self._leaderboard.import_text_scores(TEXT_SCORES_FILE, self._grid_size,
+                                                 self._num_pokemon)
 
     def exit_high_score(self):
         """
@@ -716,16 +451,21 @@ class PokemonGame(object):
             self._high_score_exist.destroy()
             self._high_score_exist = None
             
+        model = self._engine.get_model()
         top = tk.Toplevel(self._master)
         self._high_score_exist = top
-        top.title("Top 3")
+        top.title("Top " + str(self._leaderboard.get_size()))
         top_label = tk.Label(top, text="High Scores", bg="#E06666", fg="white")
         top_label.config(font=("Courier New", 20, 'bold'))
         top_label.pack(fill='x', pady=5)
-        if self._high_score_data != {}:
-            for name, scores in self._high_score_data.items():
-                score_label = tk.Label(top, text=name+': '+scores)
-                score_label.pack(fill='x',side=tk.TOP, pady=2)
+        settings_label = tk.Label(top, text="{0}x{0} board, {1} pokemons".format(
+            model.get_grid_size(), model.get_num_pokemon()))
+        settings_label.pack(fill='x', side=tk.TOP)
+        for name, seconds in self._leaderboard.top_scores(model.get_grid_size(),
+                                                          model.get_num_pokemon()):
+            minutes, seconds = divmod(seconds, 60)
+            score_label = tk.Label(top, text="{}: {:02d}m {:02d}s".format(name, minutes, seconds))
+            score_label.pack(fill='x',side=tk.TOP, pady=2)
 
         done_button = tk.Button(top,
                                    text="Done", command=self.exit_high_score)
@@ -745,6 +485,20 @@ class PokemonGame(object):
         self._board_view.destroy()
         self.draw()
 
+    def update_board(self, indexes):
+        """
+        Shows cells that changed on game board by updating their canvas items
+        in place - board is only drawn from scratch by redraw
+
+        Parameters:
+            indexes (list<int>): indexes of cells that changed in game string
+        """
+        self._board_view.update_cells(self._engine.get_model(), indexes)
+        if self._task == TASK_TWO:
+            status = self._engine.status()
+            self._status_bar.update_pokeball_stats(status["attempted_catches"],
+                                                   status["pokeballs_left"])
+
     def save_game(self):
         """
         Saves game. Just for additional information - the following will be saved
@@ -755,23 +509,32 @@ class PokemonGame(object):
         - number of pokeballs left
         - elapsed time (how long user have been playing so far)
         - board width of game board 
+        Games saved with BINARY_EXTENSION are written in the binary save format
+        which is far smaller for large boards
         """
+        filename = filedialog.asksaveasfilename(
+            initialfile="Untitled.txt", defaultextension=".txt",
+            filetypes=[("Text Documents","*.txt"), ("Binary save", "*" + BINARY_EXTENSION)])
+        if not filename:
+            return
+        if filename.endswith(BINARY_EXTENSION):
+            write_binary_save(filename, self._engine.get_model(),
+                              self._status_bar.get_elapsed_time() or 0,
+                              self._board_view.get_board_width())
+            return
+
+        snapshot = self._engine.snapshot()
         self._data_to_save = [
-            "Game_string-" + str(self._model.get_game()), 
+            "Game_string-" + str(snapshot["game"]), 
             "Grid_size-" + str(self._grid_size),
-            "Pokemon_locations-" + str(self._model.get_pokemon_locations()),
+            "Pokemon_locations-" + str(snapshot["pokemon_locations"]),
             "Elapsed_time-" + str(self._status_bar.get_elapsed_time()),
             "Board_width-" + str(self._board_view.get_board_width())
             ]
-        
-        filename = filedialog.asksaveasfilename(
-            initialfile="Untitled.txt", defaultextension=".txt",
-            filetypes=[("Text Documents","*.txt")])
-        if filename:
-            file = open(filename, 'w', encoding="utf-8")
-            for game_data in self._data_to_save:
-                file.write(game_data + "\n")
-            file.close()
+        file = open(filename, 'w', encoding="utf-8")
+        for game_data in self._data_to_save:
+            file.write(game_data + "\n")
+        file.close()
 
     def open_file(self):
         """
@@ -782,12 +545,16 @@ class PokemonGame(object):
         self._store_prev_settings = {"Game_string": None, "Pokemon_locations": None,
                           "Grid_size": None, "Elapsed_time": None, "Board_width": None}
 
-        # ensures only text file can be opened 
-        filename = filedialog.askopenfilename(filetypes=[("Text files","*.txt")])
+        # ensures only text or binary save files can be opened 
+        filename = filedialog.askopenfilename(
+            filetypes=[("Text files","*.txt"), ("Binary save", "*" + BINARY_EXTENSION)])
 
         # user clicked cancel
         if not filename:
             return None
+        if filename.endswith(BINARY_EXTENSION):
+            self.open_binary_file(filename)
+            return None
         try:
             file = open(filename, 'r', encoding="utf-8")
         except OSError:
@@ -806,9 +573,9 @@ class PokemonGame(object):
                     try:
                         value = int(format_data[1])
 
-                        if not 2 <= value <= 10 and format_data[0] == "Grid_size":
+                        if not 2 <= value <= self._max_grid_size and format_data[0] == "Grid_size":
                             tk.messagebox.showerror(title="Grid_size invalid value",
-                                                message="Grid_size must have a value of anything between or inclusive of 2 to 10")
+                                                message="Grid_size must have a value of anything between or inclusive of 2 to " + str(self._max_grid_size))
                             file.close()
                             return None
                     except ValueError:
@@ -828,15 +595,14 @@ class PokemonGame(object):
                 
             elif format_data[0] == "Game_string":
                 acceptable_char = FLAG + REVEALED + POKEMON + UNEXPOSED 
-                for char in format_data[1]:
-                    if char in acceptable_char:
-                        pass
-                    else:
-                        tk.messagebox.showerror(title="Game_string value format",
-                                                message="Game_string value string must only have either " +
-                                                POKEMON + " or " + FLAG + " or " + UNEXPOSED + " or " + REVEALED)
-                        file.close()
-                        return None
+                # large boards have millions of characters so they are checked
+                # as a set rather than one at a time
+                if not set(format_data[1]) <= set(acceptable_char):
+                    tk.messagebox.showerror(title="Game_string value format",
+                                            message="Game_string value string must only have either " +
+                                            POKEMON + " or " + FLAG + " or " + UNEXPOSED + " or " + REVEALED)
+                    file.close()
+                    return None
                 self._store_prev_settings[format_data[0]] = format_data[1]
 
             elif format_data[0] == "Pokemon_locations":
@@ -848,19 +614,15 @@ class PokemonGame(object):
                     file.close()
                     return None
                 
-                for char in format_data[1]:
-                    if char in acceptable_char:
-                        pass
-                    else:
-                        tk.messagebox.showerror(title="Pokemon_locations value format",
-                                                message="Pokemon_locations value string must have a tuple-like format. Eg '(1 ,2 , 30)'")
-                        file.close()
-                        return None
-                self._store_prev_settings[format_data[0]] = tuple(format_data[1].replace("(","").replace(")","").split(","))
-                turn_to_int = []
-                for num in self._store_prev_settings[format_data[0]]:
-                    turn_to_int.append(int(num))
-                self._store_prev_settings[format_data[0]] = tuple(turn_to_int)
+                if not set(format_data[1]) <= set(acceptable_char):
+                    tk.messagebox.showerror(title="Pokemon_locations value format",
+                                            message="Pokemon_locations value string must have a tuple-like format. Eg '(1 ,2 , 30)'")
+                    file.close()
+                    return None
+                # a tuple of one pokemon is saved with a trailing comma eg '(4,)'
+                self._store_prev_settings[format_data[0]] = tuple(
+                    int(num) for num in format_data[1].replace("(","").replace(")","").split(",")
+                    if num.strip())
             else:
                 tk.messagebox.showerror(title="Format of text file",
                                         message="text file is not in correct format it should have Grid_size, Pokeballs_left, Elapsed_time, Game_string and Pokemon_locations")
@@ -878,20 +640,50 @@ class PokemonGame(object):
         if len(self._store_prev_settings["Game_string"]) != self._store_prev_settings["Grid_size"]**2:
             tk.messagebox.showerror(title="Game_string and Grid_size error", message="Game_string should have Grid_size^2 number of elements")
             return None
+        cell_count = self._store_prev_settings["Grid_size"]**2
+        if not all(0 <= index < cell_count for index in self._store_prev_settings["Pokemon_locations"]):
+            tk.messagebox.showerror(title="Pokemon_locations and Grid_size error",
+                                    message="Pokemon_locations must be between 0 and Grid_size^2 - 1")
+            return None
 
         messagebox.showinfo(title="Game loaded successfully",message="Game loaded! Click Ok to continue!")
         self.restart_with_load()
+
+    def open_binary_file(self, filename):
+        """
+        Loads a binary save file and restarts game to previous game setting
+
+        Parameters:
+            filename (str): path of binary save file
+        """
+        try:
+            settings = read_binary_save(filename)
+        except OSError:
+            tk.messagebox.showerror(title="Error when loading file", message="File selected could not be loaded")
+            return None
+        except ValueError as error:
+            tk.messagebox.showerror(title="Format of binary file", message=str(error).capitalize())
+            return None
+
+        if not 2 <= settings["Grid_size"] <= self._max_grid_size:
+            tk.messagebox.showerror(title="Grid_size invalid value",
+                                    message="Grid_size must have a value of anything between or inclusive of 2 to " + str(self._max_grid_size))
+            return None
+        self._store_prev_settings = settings
+        messagebox.showinfo(title="Game loaded successfully",message="Game loaded! Click Ok to continue!")
+        self.restart_with_load()
         
     def new_game(self):
         """
         Starts new game
         """
-        self._model = BoardModel(self._grid_size, self._num_pokemon)
+        self._engine.new_game(self._grid_size, self._num_pokemon)
         # this is only for when an old game is loaded - to make sure it cease to
         # exist in new game
         self._status_bar.set_elapsed_time(0)
         self._restart = True
         self.redraw()
+        self.compact_journal()
 
     def restart_game(self):
         """
@@ -899,13 +691,14 @@ class PokemonGame(object):
         """
         # not calling BoardModel class ensures random hidden generated pokemons
         # would not change
-        self._model.restart_game_string()
+        self._engine.restart_game()
 
         # this is only for when an old game is loaded - to make sure it cease to
         # exist in restart game
         self._status_bar.set_elapsed_time(0)
         self._restart = True
         self.redraw()
+        self.compact_journal()
 
     def restart_with_load(self):
         """
@@ -921,12 +714,68 @@ class PokemonGame(object):
         self._board_width_loaded = self._store_prev_settings["Board_width"]
 
         #updates board_model with pokemon_num, pokemon_loc, game_string
-        self._model.set_game_settings_open(pokemon_num, pokemon_loc, game_string, grid_size)
+        self._engine.load_game(pokemon_num, pokemon_loc, game_string, grid_size)
         self._num_pokemon = pokemon_num
         self._grid_size = self._store_prev_settings["Grid_size"]
-        self._pokeball_left = self._model.get_num_pokeball_left()
         self._status_bar.set_elapsed_time(prev_elapsed_time_loaded)
         self.redraw()
+        self.compact_journal()
+
+    def undo_move(self):
+        """
+        Takes back the latest reveal or flag
+        """
+        self.show_history_move(UNDO_MOVE, self._engine.undo())
+
+    def redo_move(self):
+        """
+        Plays the latest undone reveal or flag again
+        """
+        self.show_history_move(REDO_MOVE, self._engine.redo())
+
+    def show_history_move(self, move, changed):
+        """
+        Journals an undo or redo and shows cells it changed
+
+        Parameters:
+            move (str): UNDO_MOVE or REDO_MOVE
+            changed (list<int>): indexes of cells that changed in game string
+        """
+        if not changed:
+            return
+        if self._journal is not None:
+            self._journal.record(move)
+        self.update_board(changed)
+        state = self._engine.status()["state"]
+        if state != PLAYING:
+            self.game_win_or_lost(state == WON)
+
+    def show_hint(self):
+        """
+        Shows the unexposed cell least likely to hide a pokemon
+        """
+        if self._engine.status()["state"] != PLAYING:
+            return
+        model = self._engine.get_model()
+        try:
+            probabilities = self._probability_engine.get_probabilities(model)
+        except ValueError:
+            tk.messagebox.showerror(title="No hint",
+                                    message="Some pokeballs are not on pokemons - no hint can be given")
+            return
+        if not probabilities:
+            return
+        index = min(probabilities, key=probabilities.get)
+        row, col = model.index_to_position(index)
+        messagebox.showinfo(title="Hint", message="Row {}, column {} has a {:.0%} chance of hiding a pokemon".format(
+            row + 1, col + 1, probabilities[index]))
+
+    def compact_journal(self):
+        """
+        Autosaves whole game as a snapshot - used when board is replaced
+        """
+        if self._journal is not None:
+            self._journal.compact()
 
     def quit_game(self):
         """
@@ -942,10 +791,19 @@ class PokemonGame(object):
         """
         Draws game to master window wwith most recent data
         """
-        if self._task == TASK_ONE:
+        board_width = BOARD_WIDTH
+        if self._task == TASK_TWO and self._board_width_loaded:
+            board_width = self._board_width_loaded
+
+        if board_width / self._grid_size < MIN_ITEM_CELL_PIXELS:
+            # only cells in view are drawn - straight from board model
+            self._board_view = VirtualBoardView(self._master, self._engine.get_model(),
+                                                board_width, images=self._task == TASK_TWO)
+            self._board_view.draw_board()
+        elif self._task == TASK_ONE:
             # cells will not have images
             self._board_view = BoardView(self._master, self._grid_size)
-            label_ids = self._board_view.draw_board(self._model.get_game())
+            self._board_view.draw_board(self._engine.get_model().get_game())
         elif self._task == TASK_TWO:
             # cells will have images
             self._board_view = ImageBoardView(self._master, self._grid_size)
@@ -954,22 +812,19 @@ class PokemonGame(object):
                 self._board_view.set_board_width(self._board_width_loaded)
                 self._board_view_loaded = None
             
-            label_ids = self._board_view.draw_board(self._model.get_game())
+            self._board_view.draw_board(self._engine.get_model().get_game())
 
         # users will know which cell their mouse is currently on    
-        self.bind_clicks_motion(label_ids)
+        self.bind_clicks_motion()
         self._board_view.pack(side=tk.TOP)
 
         if self._task == TASK_TWO:
             # updates attempted catches and pokeballs left
-            attempted_catches = self._model.get_num_attempted_catches()
-            self._status_bar.update_pokeball_stats(attempted_catches,
-                                                   self._model.get_num_pokeball_left())
+            status = self._engine.status()
+            self._status_bar.update_pokeball_stats(status["attempted_catches"],
+                                                   status["pokeballs_left"])
             if self._restart:
                 self._restart = False
-                self._pokeball_left = self._model.get_num_pokeball_left()
-                self._status_bar.update_pokeball_stats(attempted_catches,
-                                                   self._model.get_num_pokeball_left())
                 self._status_bar.update_start_time()
                 self._timer_on = True
             
@@ -978,29 +833,21 @@ class PokemonGame(object):
             else:
                 self.set_timer_off()                
                 
-    def bind_clicks_motion(self, label_ids):
+    def bind_clicks_motion(self):
         """
-        Bind clicks and motion on a label to the left and right click handlers.
-
-        Parameters:
-            label (tk.Widget): Label which clicks should bound to.
+        Binds clicks and motion on board to the left and right click handlers.
+        Each event is bound once on the whole canvas - handlers work out which
+        cell was used from the pixel
         """
         # bind left click and motion to allow user to find out where their cursor
         # is currently on
-        for row_of_ids in label_ids:
-            for label in row_of_ids:
-                self._board_view.tag_bind(label, "<Button-1>",
-                                          self._handle_left_click)
-                self._board_view.tag_bind(label, "<Motion>",
-                                          self._board_view.motion_detect)
+        self._board_view.bind("<Button-1>", self._handle_left_click)
+        self._board_view.bind("<Motion>", self._board_view.motion_detect)
                     
         # bind right click
         # right click can be either Button-2 or Button-3 depending on operating system
         for i in range(2,4):
-            for row_of_ids in label_ids:
-                for label in row_of_ids:
-                    self._board_view.tag_bind(label, f"<Button-{i}>",
-                                              self._handle_right_click)
+            self._board_view.bind(f"<Button-{i}>", self._handle_right_click)
 
     def _handle_left_click(self, clicked):
         """
@@ -1011,52 +858,31 @@ class PokemonGame(object):
             occur
         """
         position = self._board_view.pixel_to_position((clicked.x, clicked.y))
-        index = self._model.position_to_index(position)        
-        character = self._model.number_at_cell(self._model.get_game(),
-                                               self._model.get_pokemon_locations(),
-                                               self._grid_size, index)
-        # if clicked cell is flagged - do nothing
-        if self._model.get_game()[index] == FLAG:
-            pass
-        # if clicked cell is revealed - do nothing
-        elif self._model.get_game()[index] in REVEALED:
-            pass
-        else:
-            self._model.replace_character_at_index(index, str(character))
-
-            # chosen cell had a pokemon hidden!
-            if self._model.check_loss():
-                # user chose a cell with pokemon that wasn't flagged
-                # expose all hidden pokemons
-                for poke_index in self._model.get_pokemon_locations():
-                    self._model.replace_character_at_index(poke_index, POKEMON)
-                self.game_win_or_lost(False)
-                
-
-            # if chosen cell has no pokemon hidden - then run this block
-            # this is done so whenever game restarts - clicked cell wouldn't get
-            # through this block of code
+        index = self._engine.get_model().position_to_index(position)
+        # flagged cells are left alone. A revealed number with all its
+        # pokeballs placed reveals the rest of its neighbours (a chord) -
+        # otherwise the cell and any opening around it are revealed in one go
+        move = REVEAL_MOVE
+        if self._engine.get_model().get_cell(index) in REVEALED:
+            move = CHORD_MOVE
+        placement_pending = self._engine.get_model().is_placement_pending()
+        changed = self._engine.chord(index) if move == CHORD_MOVE else self._engine.reveal(index)
+        state = self._engine.status()["state"]
+        if changed and self._journal is not None:
+            if placement_pending:
+                # snapshots taken before the first reveal have no pokemons -
+                # the one taken now holds where they were placed
+                self._journal.compact()
             else:
-                cell_need_visible = self._model.big_fun_search(self._model.get_game(),
-                                                               self._grid_size,
-                                                               self._model.get_pokemon_locations(),
-                                                               index)
-                
-                for cell_index in cell_need_visible:
-                    if self._model.get_game()[cell_index] == FLAG:
-                        pass
-                    else:
-                        character = self._model.number_at_cell(self._model.get_game(),
-                                                               self._model.get_pokemon_locations(),
-                                                               self._grid_size, cell_index)
-                        self._model.replace_character_at_index(cell_index, str(character))
-                self.redraw()
-                # once game string is fully updated after a click - we update board GUI
-
-        # we then check if user has won
-        if self._model.check_win():
-            for poke_index in self._model.get_pokemon_locations():
-                self._model.replace_character_at_index(poke_index, POKEMON)
+                self._journal.record(move, index)
+        # once game string is fully updated after a click - we update board GUI
+        if changed:
+            self.update_board(changed)
+
+        # chosen cell had a pokemon hidden! engine exposes all hidden pokemons
+        if state == LOST:
+            self.game_win_or_lost(False)
+        elif state == WON:
             self.game_win_or_lost(True)
 
     def _handle_right_click(self, clicked):
@@ -1067,26 +893,19 @@ class PokemonGame(object):
             clicked (tk.Event): This is an event object of the pixels of where the click
             occur
         """
-        # this is to keep track of number of pokeball left for TASK 2
+        # engine keeps track of number of pokeball left for TASK 2
         # if pokeball_left = 0, then user can't flag anymore cells then
         position = self._board_view.pixel_to_position((clicked.x, clicked.y))
-        index = self._model.position_to_index(position)
-
-        if self._model.get_game()[index] == FLAG:
-            self._pokeball_left += 1
-        if self._pokeball_left > 0 or self._task == TASK_ONE:
-            if self._model.get_game()[index] == UNEXPOSED:
-                self._pokeball_left -= 1
-                
-            self._model.flag_cell(index)
-
-            if self._model.check_win():
-                # win or lose - hidden pokemons will be exposed 
-                for poke_index in self._model.get_pokemon_locations():
-                        self._model.replace_character_at_index(poke_index, POKEMON)
-                self.game_win_or_lost(True)
-            self.redraw()
-            
+        index = self._engine.get_model().position_to_index(position)
+        changed = self._engine.flag(index)
+        if changed and self._journal is not None:
+            self._journal.record(FLAG_MOVE, index)
+        if changed:
+            self.update_board(changed)
+
+        if self._engine.status()["state"] == WON:
+            # win or lose - hidden pokemons will be exposed by engine
+            self.game_win_or_lost(True)
 
     def game_win_or_lost(self, status):
         """
@@ -1096,9 +915,12 @@ class PokemonGame(object):
         Parameter:
             status (bool): False if user lost game and True if user won
         """
+        # exposed pokemons are already shown by update_board
         if self._task == TASK_TWO:
             self.set_timer_off()
-        self.redraw()
+        # a finished game is not carried on by the next run
+        if self._journal is not None:
+            self._journal.clear()
         if status:
             if self._task == TASK_TWO:
                 time_spent_by_player = self._status_bar.get_elapsed_time()
@@ -1106,15 +928,9 @@ class PokemonGame(object):
                 seconds_only = int(minutes)*60 + int(seconds)
                 player_time = "{:02d}m {:02d}s".format(int(minutes), int(seconds))
 
-                if self._temp_score_data and len(self._temp_score_data) == 3:
-                    for player_name, timing in self._temp_score_data.items():
-                        if seconds_only < timing:
-                            self.congrats_box(player_time)
-                            self._master.wait_window(self._congrats_box)
-                            name_of_winner = self._winner_name.get()
-                            self.high_score_save_file(player_time, name_of_winner)
-                            break
-                else:
+                model = self._engine.get_model()
+                if self._leaderboard.qualifies(model.get_grid_size(), model.get_num_pokemon(),
+                                               seconds_only):
                     self.congrats_box(player_time)
                     self._master.wait_window(self._congrats_box)
                     name_of_winner = self._winner_name.get()
@@ -1125,9 +941,10 @@ class PokemonGame(object):
             message_box = tk.messagebox.askyesno(title="Game Over",message="You lose! Would you like to play again?")
 
         if message_box:
-            self._model = BoardModel(self._grid_size, self._num_pokemon)
+            self._engine.new_game()
             self._restart = True
             self.redraw()
+            self.compact_journal()
         else:
             self._master.destroy()
             exit()
@@ -1141,7 +958,7 @@ class PokemonGame(object):
         """
         self._congrats_box = tk.Toplevel(self._master)
         self._winner_name = tk.StringVar(value="")
-        self._congrats_box.title("You are Top 3")
+        self._congrats_box.title("You are Top " + str(self._leaderboard.get_size()))
         message = tk.Label(self._congrats_box, text="You won in %s. Enter your name!" % time)
         message.pack(side=tk.TOP, fill='x')
         name_of_user = tk.Entry(self._congrats_box, textvariable=self._winner_name)
@@ -1154,7 +971,7 @@ class BoardView(tk.Canvas):
     """
     Visual reprensetation of the game
     """
-    def __init__(self, master, grid_size, board_width=600, *args, **kwargs):
+    def __init__(self, master, grid_size, board_width=BOARD_WIDTH, *args, **kwargs):
         """
         Updates visual of game whenever an interaction occurs if needed and
         constructs board view with game string.
@@ -1172,6 +989,8 @@ class BoardView(tk.Canvas):
 
         self._board_layout = None
         self._board_ids = None
+        # numbers shown on revealed cells, by index
+        self._text_ids = {}
         self._previous_id_highlight = None
         # to get rid of excess spacings of the canvas which can cause error
         # from motion binded
@@ -1193,6 +1012,12 @@ class BoardView(tk.Canvas):
         """
         return self._board_width
 
+    def get_cell_size(self):
+        """
+        (float) Returns width (and height) of a cell in pixels
+        """
+        return self._board_width / self._grid_size
+
     def motion_detect(self, motion):
         """
         Handles the change in borders of rectangle when there is motion on specific
@@ -1201,10 +1026,13 @@ class BoardView(tk.Canvas):
         Parameters:
             motion (tk.Event): This is an event object of pixels where motion occured
         """
+        y, x = self.pixel_to_position((motion.x, motion.y))
+        # nothing to do until cursor leaves the cell it is on
+        if self._board_ids[y][x] == self._previous_id_highlight:
+            return
         if self._previous_id_highlight:
             self.itemconfig(self._previous_id_highlight, width=1)
             
-        y, x = self.pixel_to_position((motion.x, motion.y))
         self._previous_id_highlight = self._board_ids[y][x]
         self.itemconfig(self._previous_id_highlight, width=5)
 
@@ -1220,32 +1048,55 @@ class BoardView(tk.Canvas):
         self._board_layout = self.reformat_game_string(game_string, self._grid_size)
         
         labels = []
-        size = self._board_width / self._grid_size
+        size = self.get_cell_size()
 
         for y, row in enumerate(self._board_layout):
             board_row = []
             for x, game_element in enumerate(row):
-                if game_element == POKEMON:
-                    placement = self.create_rectangle(x*size, y*size, x*size+size, y*size+size, fill="yellow")
-                elif game_element == FLAG:
-                    placement = self.create_rectangle(x*size, y*size, x*size+size, y*size+size, fill="red")
-                elif game_element == UNEXPOSED:
-                    placement = self.create_rectangle(x*size, y*size, x*size+size, y*size+size, fill="dark green")
-                elif game_element in REVEALED:
-                    placement = self.create_rectangle(x*size, y*size, x*size+size, y*size+size, fill="light green")
-                    
+                placement = self.create_rectangle(x*size, y*size, x*size+size, y*size+size,
+                                                  fill=CELL_COLOURS[game_element])
                 board_row.append(placement)
             labels.append(board_row)
             
         self._board_ids = labels
+        self._text_ids = {}
 
         for y, row in enumerate(self._board_layout):
             for x, game_element in enumerate(row):
                 if game_element in REVEALED:
-                    x_pixel, y_pixel = self.position_to_pixel((y,x))
-                    self.create_text(x_pixel, y_pixel, text=game_element)
+                    self.show_number(y, x, game_element)
         return labels
 
+    def show_number(self, row, col, number):
+        """
+        Writes number of neighbouring pokemons on a revealed cell
+
+        Parameters:
+            row (int): row of cell
+            col (int): column of cell
+            number (str): number shown
+        """
+        x_pixel, y_pixel = self.position_to_pixel((row, col))
+        self._text_ids[row*self._grid_size + col] = self.create_text(x_pixel, y_pixel,
+                                                                     text=number)
+
+    def update_cells(self, model, indexes):
+        """
+        Updates the cells that changed while every other canvas item is left
+        as it is
+
+        Parameters:
+            model (BoardModel): board model changed cells are read from
+            indexes (list<int>): indexes of cells that changed in game string
+        """
+        for index in indexes:
+            row, col = divmod(index, self._grid_size)
+            game_element = model.get_cell(index)
+            self._board_layout[row][col] = game_element
+            self.itemconfig(self._board_ids[row][col], fill=CELL_COLOURS[game_element])
+            if game_element in REVEALED and index not in self._text_ids:
+                self.show_number(row, col, game_element)
+
     def get_bbox(self, pixel):
         """
         (tuple<int, int, int, int>) Gives bounding box for given cell centered pixel coordinate
@@ -1253,13 +1104,10 @@ class BoardView(tk.Canvas):
         Parameters:
             pixel (tuple): this will be pixel coordinates clicked on canvas
         """
-        coord_x, coord_y = pixel
-
-        for row_of_id in self._board_ids:
-            for rectangle_id in row_of_id:
-                X1, Y1, X2, Y2 = self.bbox(rectangle_id)
-                if X1 <= coord_x <= X2 and Y1 <= coord_y <= Y2:
-                    return X1, Y1, X2, Y2
+        # cells sit on a regular grid so no canvas items need to be asked
+        row, col = self.pixel_to_position(pixel)
+        size = self.get_cell_size()
+        return (int(col*size), int(row*size), int((col+1)*size), int((row+1)*size))
                 
     def position_to_pixel(self, position):
         """
@@ -1269,9 +1117,8 @@ class BoardView(tk.Canvas):
             position (tuple): this is position corresponding to game string 
         """
         row, col = position
-        id_of_cell = self._board_ids[row][col]
-        X1, Y1, X2, Y2 = self.bbox(id_of_cell)
-        return (int((X1+X2)/2), int((Y1+Y2)/2))
+        size = self.get_cell_size()
+        return (int(col*size + size/2), int(row*size + size/2))
 
     def pixel_to_position(self, pixel):
         """
@@ -1283,12 +1130,11 @@ class BoardView(tk.Canvas):
             windows 
         """
         coord_x, coord_y = pixel
-
-        for y, row_of_id in enumerate(self._board_ids):
-            for x, tile in enumerate(row_of_id):
-                X1, Y1, X2, Y2 = self .bbox(tile)
-                if X1 <= coord_x <= X2 and Y1 <= coord_y <= Y2:
-                    return (y, x)
+        # pixels on the edge of the board belong to its last row or column
+        size = self.get_cell_size()
+        last = self._grid_size - 1
+        return (max(0, min(int(coord_y // size), last)),
+                max(0, min(int(coord_x // size), last)))
 
     def reformat_game_string(self, game_string, grid_size):
         """
@@ -1316,7 +1162,7 @@ class ImageBoardView(BoardView):
     """
     Provides images to the board game instead of normal boxes
     """
-    def __init__(self, master, grid_size, board_width=600, *args, **kwargs):
+    def __init__(self, master, grid_size, board_width=BOARD_WIDTH, *args, **kwargs):
         """
         Updates visual of game whenever an interaction occurs if needed and
         constructs board view with game string. Additionally, it replacces
@@ -1334,6 +1180,16 @@ class ImageBoardView(BoardView):
         self._id_image_update = None
         self._y_prev = None
         self._x_prev = None
+        # cell the cursor was last seen on and the scheduled hover update
+        self._hover_position = None
+        self._hover_after_id = None
+
+    def get_cell_size(self):
+        """
+        (int) Returns width (and height) of a cell in pixels - images are
+        rounded up to whole pixels
+        """
+        return math.ceil(self._board_width / self._grid_size)
 
     def draw_board(self, game_string):
         """
@@ -1347,37 +1203,14 @@ class ImageBoardView(BoardView):
         self._board_layout = self.reformat_game_string(game_string, self._grid_size)
         label_img_placed = []
         label_img_id = []
-        size = math.ceil(self._board_width / self._grid_size)
-
-        img_dict_of_pokemon = {
-            POKEMON: ["images/pokemon_sprites/charizard.gif", "images/pokemon_sprites/cyndaquil.gif",
-                      "images/pokemon_sprites/pikachu.gif", "images/pokemon_sprites/psyduck.gif",
-                      "images/pokemon_sprites/togepi.gif", "images/pokemon_sprites/umbreon.gif"],
-            FLAG: ["images/pokeball.gif"],
-            UNEXPOSED: ["images/unrevealed.gif"],
-            REVEALED: ["images/zero_adjacent.gif", "images/one_adjacent.gif",
-                       "images/two_adjacent.gif", "images/three_adjacent.gif",
-                       "images/four_adjacent.gif", "images/five_adjacent.gif",
-                       "images/six_adjacent.gif", "images/seven_adjacent.gif",
-                       "images/eight_adjacent.gif"]
-            }
-        
+        size = self.get_cell_size()
+
         for y, row in enumerate(self._board_layout):
             board_row_img_id = []
             board_row_img_placed = []
             for x, game_element in enumerate(row):
-                if game_element in REVEALED:
-                    img_temp = Image.open(img_dict_of_pokemon[REVEALED][int(game_element)])
-                elif game_element == UNEXPOSED:
-                    img_temp = Image.open(img_dict_of_pokemon[game_element][0])
-                elif game_element == FLAG:
-                    img_temp = Image.open(img_dict_of_pokemon[game_element][0])
-                else:
-                    random_poke = random.randint(0, 5)
-                    img_temp = Image.open(img_dict_of_pokemon[game_element][random_poke])
-
-                img_temp = img_temp.resize((int(size),int(size)))
-                image = ImageTk.PhotoImage(img_temp)
+                # cells showing the same sprite share one cached image
+                image = TILE_CACHE.get_tile(self.sprite_path(game_element), size)
                 placement_img = self.create_image(x*size+size/2, y*size+size/2, image=image)
                 
                 board_row_img_id.append(placement_img)
@@ -1390,44 +1223,94 @@ class ImageBoardView(BoardView):
         self._board_ids = label_img_id
         return label_img_id
 
+    def sprite_path(self, game_element):
+        """
+        (str) Returns path of sprite shown for a cell - hidden pokemons are
+        shown as a random pokemon
+
+        Parameters:
+            game_element (str): character of cell in game string
+        """
+        if game_element in REVEALED:
+            return SPRITES[REVEALED][int(game_element)]
+        if game_element == POKEMON:
+            return random.choice(SPRITES[POKEMON])
+        return SPRITES[game_element][0]
+
+    def update_cells(self, model, indexes):
+        """
+        Swaps the images of cells that changed while every other canvas item is
+        left as it is
+
+        Parameters:
+            model (BoardModel): board model changed cells are read from
+            indexes (list<int>): indexes of cells that changed in game string
+        """
+        size = self.get_cell_size()
+        for index in indexes:
+            row, col = divmod(index, self._grid_size)
+            game_element = model.get_cell(index)
+            self._board_layout[row][col] = game_element
+            image = TILE_CACHE.get_tile(self.sprite_path(game_element), size)
+            self.image[row][col] = image
+            self.itemconfig(self._board_ids[row][col], image=image)
+            # a cell that is no longer unexposed must not be reset by hovering
+            if self._board_ids[row][col] == self._id_image_update:
+                self._id_image_update = None
+            if (row, col) == self._hover_position:
+                self._hover_position = None
+
     def motion_detect(self, motion):
         """
         Handles the change in images on board when there is motion on specific
-        canvas
+        canvas. Motion within the same cell is ignored and a burst of motion
+        is shown once, on the next frame
 
         Parameters:
             motion (tk.Event): This is an event object of pixels where motion occured
         """
-        UNEXPOSED_img = "images/unrevealed.gif"
-        UNEXPOSED_MOVE_img = "images/unrevealed_moved.gif"
-        
-        size = math.ceil(self._board_width / self._grid_size)
-        y, x = self.pixel_to_position((motion.x, motion.y))
-        game_element = self._board_layout[y][x]
-
-        img_temp_move = Image.open(UNEXPOSED_MOVE_img)
-        img_temp_move = img_temp_move.resize((int(size),int(size)))
-        image_move = ImageTk.PhotoImage(img_temp_move)
-
-        img_temp_no_move = Image.open(UNEXPOSED_img)
-        img_temp_no_move = img_temp_no_move.resize((int(size),int(size)))
-        image_no_move = ImageTk.PhotoImage(img_temp_no_move)
-
-        if game_element == UNEXPOSED:
-            if self._id_image_update is None:
-                self._id_image_update = self._board_ids[y][x]
-                self._y_prev = y
-                self._x_prev = x
-                self.image[y][x] = image_move
-                self.itemconfig(self._id_image_update, image=image_move)
-            elif self._id_image_update is not None:
-                self.image[self._y_prev][self._x_prev] = image_no_move
-                self.itemconfig(self._id_image_update, image=image_no_move)
-                self._id_image_update = self._board_ids[y][x]
-                self._y_prev = y
-                self._x_prev = x
-                self.image[y][x] = image_move
-                self.itemconfig(self._id_image_update, image=image_move)            
+        position = self.pixel_to_position((motion.x, motion.y))
+        if position == self._hover_position:
+            return
+        self._hover_position = position
+        if self._hover_after_id is None:
+            self._hover_after_id = self.after(HOVER_DELAY, self.show_hover)
+
+    def show_hover(self):
+        """
+        Highlights the unexposed cell the cursor was last seen on and puts the
+        previously highlighted cell back to normal. Both tiles come from the
+        tile cache so nothing is loaded or resized
+        """
+        self._hover_after_id = None
+        # the hovered cell may have been revealed or flagged since motion was seen
+        if self._hover_position is None:
+            return
+        y, x = self._hover_position
+        if self._board_layout[y][x] != UNEXPOSED or self._board_ids[y][x] == self._id_image_update:
+            return
+
+        size = self.get_cell_size()
+        if self._id_image_update is not None:
+            image_no_move = TILE_CACHE.get_tile(SPRITES[UNEXPOSED][0], size)
+            self.image[self._y_prev][self._x_prev] = image_no_move
+            self.itemconfig(self._id_image_update, image=image_no_move)
+
+        image_move = TILE_CACHE.get_tile(HOVER_SPRITE, size)
+        self._id_image_update = self._board_ids[y][x]
+        self._y_prev = y
+        self._x_prev = x
+        self.image[y][x] = image_move
+        self.itemconfig(self._id_image_update, image=image_move)
+
+    def destroy(self):
+        """
+        Cancels any hover update still waiting before board is destroyed
+        """
+        if self._hover_after_id is not None:
+            self.after_cancel(self._hover_after_id)
+            self._hover_after_id = None
+        super().destroy()
 
     def get_board_ids(self):
         """
@@ -1435,12 +1318,214 @@ class ImageBoardView(BoardView):
         """
         return self._board_ids
             
+class VirtualBoardView(ImageBoardView):
+    """
+    Board too big to draw whole - only the cells in view have canvas items
+    """
+    def __init__(self, master, model, board_width=BOARD_WIDTH, images=True, *args, **kwargs):
+        """
+        Draws a window of cells (plus a margin of VIEW_MARGIN cells) read
+        straight from board model. Canvas items are kept in a pool the size of
+        the window and reused for the cells scrolled into view, so a board of
+        millions of cells needs only a few thousand items. The mouse wheel
+        scrolls (holding shift scrolls sideways) and control with the mouse
+        wheel zooms between ZOOM_LEVELS
+
+        Parameters:
+            master (object): tkinter.Tk class used to represent 'master' window
+            model (BoardModel): board model cells are read from
+            board_width (int): width of window size
+            images (bool): True if cells show sprites instead of coloured boxes
+        """
+        super().__init__(master, model.get_grid_size(), board_width, *args, **kwargs)
+        self._model = model
+        self._images = images
+        self._zoom = 0
+        # pool of items - slot [r][c] shows the cell in view whose row and
+        # column are r and c modulo the pool size
+        self._pool_size = 0
+        self._slot_items = None
+        self._slot_texts = None
+        self._slot_cells = None
+        self._hover_id = None
+
+    def get_cell_size(self):
+        """
+        (int) Returns width (and height) of a cell in pixels at current zoom
+        """
+        return ZOOM_LEVELS[self._zoom]
+
+    def draw_board(self, game_string=None):
+        """
+        (list<list<int>>) Creates the pool of items for current zoom, draws
+        the cells in view and returns the item ids of the pool
+
+        Parameters:
+            game_string (str): not needed - cells are read from board model
+        """
+        size = self.get_cell_size()
+        side = size * self._grid_size
+        self.delete("all")
+        self.config(scrollregion=(0, 0, side, side), xscrollincrement=size,
+                    yscrollincrement=size)
+
+        self._pool_size = min(self._grid_size,
+                              math.ceil(self._board_width / size) + 1 + 2*VIEW_MARGIN)
+        self._slot_items = []
+        self._slot_texts = []
+        for _ in range(self._pool_size):
+            if self._images:
+                self._slot_items.append([self.create_image(0, 0) for _ in range(self._pool_size)])
+            else:
+                self._slot_items.append([self.create_rectangle(0, 0, 0, 0)
+                                         for _ in range(self._pool_size)])
+                self._slot_texts.append([self.create_text(0, 0) for _ in range(self._pool_size)])
+        self._slot_cells = [[None]*self._pool_size for _ in range(self._pool_size)]
+        self._hover_id = self.create_rectangle(0, 0, 0, 0, outline="white", width=3)
+        self._hover_position = None
+
+        for event in ("<MouseWheel>", "<Shift-MouseWheel>", "<Control-MouseWheel>",
+                      "<Button-4>", "<Button-5>", "<Shift-Button-4>", "<Shift-Button-5>",
+                      "<Control-Button-4>", "<Control-Button-5>"):
+            self.bind(event, self.scroll_board)
+        self.refresh_view()
+        self._board_ids = self._slot_items
+        return self._slot_items
+
+    def refresh_view(self):
+        """
+        Moves the pooled items of cells that left the view onto the cells that
+        came into it - cells still in view are left alone
+        """
+        size = self.get_cell_size()
+        last_first = self._grid_size - self._pool_size
+        first_row = max(0, min(int(self.canvasy(0) // size) - VIEW_MARGIN, last_first))
+        first_col = max(0, min(int(self.canvasx(0) // size) - VIEW_MARGIN, last_first))
+        for row in range(first_row, first_row + self._pool_size):
+            slot_cells = self._slot_cells[row % self._pool_size]
+            for col in range(first_col, first_col + self._pool_size):
+                if slot_cells[col % self._pool_size] != row*self._grid_size + col:
+                    self.show_cell(row, col)
+
+    def show_cell(self, row, col):
+        """
+        Draws the cell at row and col on its pooled items
+
+        Parameters:
+            row (int): row of cell
+            col (int): column of cell
+        """
+        index = row*self._grid_size + col
+        game_element = self._model.get_cell(index)
+        slot_row, slot_col = row % self._pool_size, col % self._pool_size
+        self._slot_cells[slot_row][slot_col] = index
+        size = self.get_cell_size()
+        x, y = col*size, row*size
+
+        item = self._slot_items[slot_row][slot_col]
+        if self._images:
+            if game_element == POKEMON:
+                # the same pokemon is shown every time cell comes back into view
+                path = SPRITES[POKEMON][index % len(SPRITES[POKEMON])]
+            else:
+                path = self.sprite_path(game_element)
+            self.coords(item, x + size/2, y + size/2)
+            self.itemconfig(item, image=TILE_CACHE.get_tile(path, size))
+        else:
+            text = self._slot_texts[slot_row][slot_col]
+            self.coords(item, x, y, x + size, y + size)
+            self.itemconfig(item, fill=CELL_COLOURS[game_element])
+            self.coords(text, x + size/2, y + size/2)
+            self.itemconfig(text, text=game_element if game_element in REVEALED else "")
+
+    def update_cells(self, model, indexes):
+        """
+        Redraws the cells that changed and are in view - the others are drawn
+        from board model once they are scrolled into view
+
+        Parameters:
+            model (BoardModel): board model changed cells are read from
+            indexes (list<int>): indexes of cells that changed in game string
+        """
+        self._model = model
+        for index in indexes:
+            row, col = divmod(index, self._grid_size)
+            if self._slot_cells[row % self._pool_size][col % self._pool_size] == index:
+                self.show_cell(row, col)
+
+    def scroll_board(self, event):
+        """
+        Scrolls board a cell at a time when the mouse wheel is used, or zooms
+        when control is held
+
+        Parameters:
+            event (tk.Event): mouse wheel event - shift is held to scroll
+            sideways and control to zoom
+        """
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        if event.state & 4:
+            self.zoom(-step)
+            return
+        if event.state & 1:
+            self.xview_scroll(step*3, "units")
+        else:
+            self.yview_scroll(step*3, "units")
+        self.refresh_view()
+
+    def zoom(self, step):
+        """
+        Moves to a larger (step > 0) or smaller zoom level while keeping the
+        cell in the middle of the view where it is
+
+        Parameters:
+            step (int): number of zoom levels moved
+        """
+        zoom = max(0, min(self._zoom + step, len(ZOOM_LEVELS) - 1))
+        if zoom == self._zoom:
+            return
+        middle = self._board_width / 2
+        row, col = self.pixel_to_position((middle, middle))
+        self._zoom = zoom
+        size = self.get_cell_size()
+        side = size * self._grid_size
+        self.config(scrollregion=(0, 0, side, side))
+        self.xview_moveto(max(0, col*size + size/2 - middle) / side)
+        self.yview_moveto(max(0, row*size + size/2 - middle) / side)
+        self.draw_board()
+
+    def motion_detect(self, motion):
+        """
+        Outlines the cell the cursor is on
+
+        Parameters:
+            motion (tk.Event): This is an event object of pixels where motion occured
+        """
+        position = self.pixel_to_position((motion.x, motion.y))
+        if position == self._hover_position:
+            return
+        self._hover_position = position
+        row, col = position
+        size = self.get_cell_size()
+        self.coords(self._hover_id, col*size, row*size, col*size + size, row*size + size)
+
+    def pixel_to_position(self, pixel):
+        """
+        (tuple<int, int>) Returns position of cell under a pixel of the
+        (scrolled) canvas window
+
+        Parameters:
+            pixel (tuple<int, int>): pixel that corresponds to the vicinity a certain cell on
+            windows
+        """
+        coord_x, coord_y = pixel
+        return super().pixel_to_position((self.canvasx(coord_x), self.canvasy(coord_y)))
+
 def main():
     """
     Initiate game!
     """
     root = tk.Tk()
-    PokemonGame(root)
+    PokemonGame(root, journal_directory=AUTOSAVE_DIRECTORY)
     root.mainloop()
 
 if __name__ == "__main__":
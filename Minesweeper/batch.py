@@ -0,0 +1,248 @@
+# Batch simulator of A3 Pokemon Game - many boards of the same grid size held
+# as stacked NumPy arrays so studies can play thousands of games with a single
+# vectorized call per move. Needs NumPy, which the game itself does not
+
+import numpy as np
+
+from board_model import POKEMON, FLAG, UNEXPOSED, REVEALED, UNEXPOSED_CODE, FLAG_CODE
+
+# CONSTANTS
+# cells are stored as the cell codes of BoardModel.get_cell_codes
+_CODE_TO_CHAR = np.array(list(REVEALED + UNEXPOSED + FLAG + POKEMON))
+_CHAR_TO_CODE = {char: code for code, char in enumerate(_CODE_TO_CHAR)}
+
+class BatchBoards(object):
+    """
+    Represents many boards of the same grid size played side by side
+    """
+    def __init__(self, grid_size, pokemon_locations, games=None):
+        """
+        Stores pokemons, numbers and cells of every board as rows of 2d arrays.
+        Every method works on all boards at once and gives the same results as
+        the BoardModel method with the same name would give for each board
+
+        Parameters:
+            grid_size (int): the size of the grid used by every board
+            pokemon_locations (list<tuple<int, ...>>): pokemon locations of each board
+            games (list<str>): game string of each board, unexposed boards if None
+        """
+        self._grid_size = grid_size
+        cell_count = grid_size*grid_size
+        self._count = len(pokemon_locations)
+
+        self._pokemons = np.zeros((self._count, cell_count), dtype=bool)
+        for board, locations in enumerate(pokemon_locations):
+            self._pokemons[board, list(locations)] = True
+        self._num_pokemons = self._pokemons.sum(axis=1)
+        self._adjacent = _neighbour_count(self._pokemons.reshape(-1, grid_size, grid_size))
+        self._adjacent = self._adjacent.reshape(self._count, cell_count)
+
+        if games is None:
+            self._cells = np.full((self._count, cell_count), UNEXPOSED_CODE, dtype=np.uint8)
+        else:
+            self._cells = np.array([[_CHAR_TO_CODE[char] for char in game] for game in games],
+                                   dtype=np.uint8).reshape(self._count, cell_count)
+
+    def get_count(self):
+        """
+        (int) Returns number of boards in batch
+        """
+        return self._count
+
+    def get_grid_size(self):
+        """
+        (int) Returns grid size shared by every board
+        """
+        return self._grid_size
+
+    def get_games(self):
+        """
+        (list<str>) Returns game string of every board
+        """
+        return ["".join(row) for row in _CODE_TO_CHAR[self._cells]]
+
+    def number_at_cell(self, indexes):
+        """
+        (np.ndarray<int>) Returns number of neighbouring pokemons of the cell at
+        index of each board
+
+        Parameters:
+            indexes (array-like<int>): one index per board
+        """
+        return self._adjacent[np.arange(self._count), np.asarray(indexes)].astype(int)
+
+    def big_fun_search(self, indexes):
+        """
+        (np.ndarray<bool>) Returns a (boards, cells) mask of the cells big_fun_search
+        gives for the cell at index of each board - the cell itself when it is
+        flagged or numbered, otherwise the opening around it without the cell
+
+        Parameters:
+            indexes (array-like<int>): one index per board
+        """
+        indexes = np.asarray(indexes)
+        boards = np.arange(self._count)
+        found = np.zeros(self._cells.shape, dtype=bool)
+
+        single = (self._cells[boards, indexes] == FLAG_CODE) | (self._adjacent[boards, indexes] != 0)
+        found[boards[single], indexes[single]] = True
+
+        spread = ~single
+        found[spread] = self._openings(boards[spread], indexes[spread])
+        found[boards[spread], indexes[spread]] = False
+        return found
+
+    def reveal(self, indexes):
+        """
+        (np.ndarray<bool>) Reveals cell at index of each board together with
+        any opening around it like BoardModel.reveal_cell, and returns a
+        (boards, cells) mask of every cell that was revealed
+
+        Parameters:
+            indexes (array-like<int>): one index per board, boards given -1 are
+            left as they are
+        """
+        indexes = np.asarray(indexes)
+        changed = np.zeros(self._cells.shape, dtype=bool)
+        boards = np.nonzero(indexes >= 0)[0]
+        indexes = indexes[boards]
+
+        # flagged and already numbered cells are left alone
+        cells = self._cells[boards, indexes]
+        hidden = (cells != FLAG_CODE) & (cells >= UNEXPOSED_CODE)
+        boards, indexes = boards[hidden], indexes[hidden]
+        self._cells[boards, indexes] = self._adjacent[boards, indexes]
+        changed[boards, indexes] = True
+
+        spread = (self._adjacent[boards, indexes] == 0) & ~self._pokemons[boards, indexes]
+        boards, indexes = boards[spread], indexes[spread]
+        if len(boards):
+            cells = self._cells[boards]
+            revealed = self._openings(boards, indexes) & (cells == UNEXPOSED_CODE)
+            cells[revealed] = self._adjacent[boards][revealed]
+            self._cells[boards] = cells
+            changed[boards] |= revealed
+        return changed
+
+    def flag(self, indexes):
+        """
+        Toggles pokeball at index of each board like BoardModel.flag_cell
+
+        Parameters:
+            indexes (array-like<int>): one index per board, boards given -1 are
+            left as they are
+        """
+        indexes = np.asarray(indexes)
+        boards = np.nonzero(indexes >= 0)[0]
+        indexes = indexes[boards]
+        cells = self._cells[boards, indexes]
+        toggled = np.where(cells == UNEXPOSED_CODE, FLAG_CODE,
+                           np.where(cells == FLAG_CODE, UNEXPOSED_CODE, cells))
+        self._cells[boards, indexes] = toggled
+
+    def check_loss(self):
+        """
+        (np.ndarray<bool>) Returns True for every board where a pokemon has been
+        revealed
+        """
+        return ((self._cells < UNEXPOSED_CODE) & self._pokemons).any(axis=1)
+
+    def check_win(self):
+        """
+        (np.ndarray<bool>) Returns True for every board where every other cell is
+        revealed and every pokemon has a pokeball on it
+        """
+        revealed = (self._cells < UNEXPOSED_CODE).sum(axis=1)
+        caught = ((self._cells == FLAG_CODE) & self._pokemons).sum(axis=1)
+        non_pokemon_cells = self._cells.shape[1] - self._num_pokemons
+        return (revealed == non_pokemon_cells) & (caught == self._num_pokemons)
+
+    def _openings(self, boards, indexes):
+        """
+        (np.ndarray<bool>) Floods out from index of each of the given boards
+        through unflagged cells with no neighbouring pokemons, growing every
+        opening one ring per step, and returns a (boards, cells) mask of the
+        openings together with the cells around them
+
+        Parameters:
+            boards (np.ndarray<int>): boards that are searched
+            indexes (np.ndarray<int>): one index per board searched
+        """
+        shape = (len(boards), self._grid_size, self._grid_size)
+        passable = ((self._adjacent[boards] == 0) & ~self._pokemons[boards]
+                    & (self._cells[boards] != FLAG_CODE)).reshape(shape)
+        opening = np.zeros(shape, dtype=bool)
+        rows, cols = np.divmod(indexes, self._grid_size)
+        opening[np.arange(len(boards)), rows, cols] = True
+
+        # only openings that grew in the last step are grown again
+        growing = np.arange(len(boards))
+        while len(growing):
+            grown = (_dilate(opening[growing]) & passable[growing]) | opening[growing]
+            still_growing = (grown != opening[growing]).any(axis=(1, 2))
+            opening[growing] = grown
+            growing = growing[still_growing]
+        return _dilate(opening).reshape(len(boards), self._grid_size*self._grid_size)
+
+def random_batch(count, grid_size, num_pokemon, seed=None):
+    """
+    (BatchBoards) Returns a batch of unexposed boards with pokemons placed at
+    random
+
+    Parameters:
+        count (int): number of boards
+        grid_size (int): the size of the grid used by every board
+        num_pokemon (int): number of pokemons hidden on each board
+        seed (int): seed of the random number generator
+    """
+    rng = np.random.default_rng(seed)
+    cell_count = grid_size*grid_size
+    num_pokemon = min(num_pokemon, cell_count)
+    # a random order of every board's cells - the first few get pokemons
+    order = rng.random((count, cell_count)).argsort(axis=1)
+    return BatchBoards(grid_size, order[:, :num_pokemon])
+
+def batch_from_models(models):
+    """
+    (BatchBoards) Returns a batch holding the current state of board models of
+    the same grid size
+
+    Parameters:
+        models (list<BoardModel>): board models copied into batch
+    """
+    grid_size = models[0].get_grid_size()
+    return BatchBoards(grid_size, [model.get_pokemon_locations() for model in models],
+                       [model.get_game() for model in models])
+
+def _neighbour_count(cells):
+    """
+    (np.ndarray<uint8>) Returns number of set neighbours of every cell of a
+    stack of (boards, rows, cols) boolean grids
+
+    Parameters:
+        cells (np.ndarray<bool>): stack of grids
+    """
+    boards, rows, cols = cells.shape
+    padded = np.pad(cells, ((0, 0), (1, 1), (1, 1))).astype(np.uint8)
+    count = np.zeros(cells.shape, dtype=np.uint8)
+    for row_step in range(3):
+        for col_step in range(3):
+            if (row_step, col_step) != (1, 1):
+                count += padded[:, row_step:row_step+rows, col_step:col_step+cols]
+    return count
+
+def _dilate(cells):
+    """
+    (np.ndarray<bool>) Returns stack of grids grown by one cell in all eight
+    directions
+
+    Parameters:
+        cells (np.ndarray<bool>): stack of (boards, rows, cols) grids
+    """
+    boards, rows, cols = cells.shape
+    padded = np.pad(cells, ((0, 0), (1, 1), (1, 1)))
+    grown = cells.copy()
+    for row_step in range(3):
+        for col_step in range(3):
+            grown |= padded[:, row_step:row_step+rows, col_step:col_step+cols]
+    return grown
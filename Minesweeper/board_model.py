@@ -0,0 +1,962 @@
+# Model of A3 Pokemon Game - game state and rules of the board, kept free of
+# any GUI imports so it can be used without a display
+
+import random
+
+from array import array
+
+# CONSTANTS
+POKEMON = "☺"
+FLAG = "♥"
+UNEXPOSED = "~"
+EXPOSED = "0"
+UP = "up"
+DOWN = "down"
+LEFT = "left"
+RIGHT = "right"
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT,
+              f"{UP}-{LEFT}", f"{UP}-{RIGHT}",
+              f"{DOWN}-{LEFT}", f"{DOWN}-{RIGHT}")
+REVEALED = "0123456789"
+MAX_GRID_SIZE = 10
+# large board mode allows grids far bigger than the normal game
+LARGE_MAX_GRID_SIZE = 2000
+# cell states are small codes used by binary save files and batch boards -
+# numbers are stored as themselves
+UNEXPOSED_CODE = len(REVEALED)
+FLAG_CODE = UNEXPOSED_CODE + 1
+POKEMON_CODE = UNEXPOSED_CODE + 2
+
+# BoardModel keeps its game state as one byte per cell. Digits and UNEXPOSED
+# are already ascii so only POKEMON and FLAG need single byte stand ins
+_STORED_POKEMON = "P"
+_STORED_FLAG = "F"
+_TO_STORED = str.maketrans(POKEMON + FLAG, _STORED_POKEMON + _STORED_FLAG)
+_FROM_STORED = str.maketrans(_STORED_POKEMON + _STORED_FLAG, POKEMON + FLAG)
+_CHAR_TO_BYTE = {char: ord(char.translate(_TO_STORED))
+                 for char in POKEMON + FLAG + UNEXPOSED + REVEALED}
+_BYTE_TO_CHAR = {byte: char for char, byte in _CHAR_TO_BYTE.items()}
+_DIGIT_BYTES = frozenset(REVEALED.encode("ascii"))
+_FLAG_BYTE = _CHAR_TO_BYTE[FLAG]
+_DIGIT_BYTE_ZERO = _CHAR_TO_BYTE["0"]
+_UNEXPOSED_BYTE = _CHAR_TO_BYTE[UNEXPOSED]
+# translation tables between stored bytes and cell state codes
+_STORED_CODES = (REVEALED + UNEXPOSED + FLAG + POKEMON).translate(_TO_STORED).encode("ascii")
+_STORED_TO_CODE = bytes(_STORED_CODES.index(byte) if byte in _STORED_CODES else 255
+                        for byte in range(256))
+_CODE_TO_STORED = _STORED_CODES + bytes(256 - len(_STORED_CODES))
+# every cell has a byte holding its number of neighbouring pokemons in the low
+# bits, with _POKEMON_BIT set when the cell hides a pokemon itself
+_POKEMON_BIT = 0x10
+_COUNT_MASK = 0x0f
+# translation tables used to work on whole rows of cells at once
+_COUNT_TO_DIGIT = bytes(_DIGIT_BYTE_ZERO + (count & _COUNT_MASK) for count in range(256))
+_IS_ZERO = bytes([1]) + bytes(255)
+_IS_NOT_FLAG = bytes(int(byte != _FLAG_BYTE) for byte in range(256))
+_IS_POKEMON = bytes(int(bool(byte & _POKEMON_BIT)) for byte in range(256))
+# openings of boards between these many cells are indexed the first time one is
+# revealed - smaller boards are searched as quickly as they are looked up and
+# bigger boards search each opening when it is clicked instead. Every indexed
+# board has fewer than 2**16 cells so the index is kept as unsigned shorts
+_MIN_INDEXED_OPENING_CELLS = 24*24
+_INDEXED_OPENING_CELLS = 100*100
+
+# edges of the grid a cell can touch - stored as bit flags per cell
+_TOP_EDGE = 1
+_BOTTOM_EDGE = 2
+_LEFT_EDGE = 4
+_RIGHT_EDGE = 8
+# (row step, column step, edges that block the step) in the order of DIRECTIONS
+_DIRECTION_STEPS = {
+    UP: (-1, 0, _TOP_EDGE),
+    DOWN: (1, 0, _BOTTOM_EDGE),
+    LEFT: (0, -1, _LEFT_EDGE),
+    RIGHT: (0, 1, _RIGHT_EDGE),
+    f"{UP}-{LEFT}": (-1, -1, _TOP_EDGE | _LEFT_EDGE),
+    f"{UP}-{RIGHT}": (-1, 1, _TOP_EDGE | _RIGHT_EDGE),
+    f"{DOWN}-{LEFT}": (1, -1, _BOTTOM_EDGE | _LEFT_EDGE),
+    f"{DOWN}-{RIGHT}": (1, 1, _BOTTOM_EDGE | _RIGHT_EDGE)
+    }
+# neighbour tables are built once per grid size and shared by every board
+_NEIGHBOUR_TABLES = {}
+
+def neighbour_table(grid_size):
+    """
+    (tuple<bytes, tuple<tuple<int, ...>, ...>>) Returns the neighbour table of a
+    grid size, building it the first time that grid size is used. The table has
+    the edges each cell touches as bit flags and for every combination of edges
+    the index offsets of the neighbours (in the order of DIRECTIONS), so the
+    neighbours of a cell are index + offset for offset in offsets[edges[index]]
+
+    Parameters:
+        grid_size (int): Grid size of the game
+    """
+    table = _NEIGHBOUR_TABLES.get(grid_size)
+    if table is None:
+        col_edges = bytearray(grid_size)
+        col_edges[0] |= _LEFT_EDGE
+        col_edges[-1] |= _RIGHT_EDGE
+
+        def row_edges(edges):
+            return bytes(col_edge | edges for col_edge in col_edges)
+
+        if grid_size == 1:
+            cell_edges = row_edges(_TOP_EDGE | _BOTTOM_EDGE)
+        else:
+            cell_edges = (row_edges(_TOP_EDGE) + row_edges(0)*(grid_size-2)
+                          + row_edges(_BOTTOM_EDGE))
+
+        edge_offsets = tuple(
+            tuple(row_step*grid_size + col_step
+                  for row_step, col_step, blocked_by in _DIRECTION_STEPS.values()
+                  if not edges & blocked_by)
+            for edges in range(16))
+        table = (cell_edges, edge_offsets)
+        _NEIGHBOUR_TABLES[grid_size] = table
+    return table
+
+class BoardModel(object):
+    """
+    Represents board game involved in game
+    """
+    # servers hold many boards at once so boards keep no instance dictionary
+    __slots__ = ("_grid_size", "_num_pokemon", "_seed", "_rng", "_cells", "_game",
+                 "_placement_pending", "_adjacent", "_num_hidden", "_opening_of",
+                 "_opening_cells", "_opening_bounds", "_num_revealed", "_num_flags",
+                 "_num_caught", "_num_pokemon_revealed", "_history_depth", "_undo", "_redo")
+
+    def __init__(self, grid_size, num_pokemon, seed=None, rng=None, safe_first_click=False,
+                 history_depth=0):
+        """
+        It stores and manages internal game state. It is a model class
+
+        Parameters:
+            grid_size (int): the size of the grid used
+            num_pokemon (int): number of hidden pokemon involved
+            seed (int): seed of the random number generator so boards can be
+            generated again
+            rng (random.Random): random number generator used to place pokemons
+            instead of one made from seed
+            safe_first_click (bool): holds pokemons back until the first cell is
+            revealed so that cell and its neighbours never hide a pokemon
+            history_depth (int): number of reveals and flags that can be undone,
+            none if 0
+        """
+        self._grid_size = grid_size
+        self._num_pokemon = num_pokemon
+        # the seed is kept rather than a generator made from it, which would
+        # take more memory than the rest of a small board
+        self._seed = seed
+        self._rng = rng
+        # one byte per cell - get_game builds (and caches) the string view
+        self._cells = bytearray([_CHAR_TO_BYTE[UNEXPOSED]]) * grid_size*grid_size
+        self._game = None
+        self._placement_pending = safe_first_click
+        self._history_depth = history_depth
+        # undo and redo histories are only made once something is recorded
+        self._undo = None
+        self._redo = None
+        if safe_first_click:
+            self._count_adjacent(())
+        else:
+            self._count_adjacent(self.generate_pokemons(grid_size, num_pokemon))
+        self._count_cells()
+        
+    def get_pokemon_locations(self):
+        """
+        (tuple<int>) Returns indices of pokemon locations in game string, in
+        increasing order
+        """
+        if not self._num_hidden:
+            return ()
+        # pokemons are only kept as a bit of each cell so they are found with
+        # bytes methods rather than stored a second time
+        is_pokemon = self._adjacent.translate(_IS_POKEMON)
+        pokemon_locations = []
+        index = is_pokemon.find(1)
+        while index != -1:
+            pokemon_locations.append(index)
+            index = is_pokemon.find(1, index + 1)
+        return tuple(pokemon_locations)
+
+    def is_placement_pending(self):
+        """
+        (bool) Returns True if pokemons are still to be placed by the first
+        cell revealed (safe first click)
+        """
+        return self._placement_pending
+
+    def set_pokemon_locations(self, pokemon_locations):
+        """
+        Moves hidden pokemons to new locations. Only the numbers around pokemons
+        that were added or removed are updated
+
+        Parameters:
+            pokemon_locations (tuple<int, ...>): New indices of pokemon locations
+        """
+        previous = set(self.get_pokemon_locations())
+        current = set(pokemon_locations)
+        for index in previous ^ current:
+            self._track_cell(index, -1)
+            self._set_pokemon(index, index in current)
+            self._track_cell(index, 1)
+        self._clear_openings()
+
+    def _count_adjacent(self, pokemon_locations):
+        """
+        Builds the number of neighbouring pokemons of every cell with one pass
+        over the pokemon locations
+
+        Parameters:
+            pokemon_locations (tuple<int, ...>): indices of pokemon locations
+        """
+        self._adjacent = bytearray(self._grid_size*self._grid_size)
+        self._num_hidden = 0
+        for index in pokemon_locations:
+            self._set_pokemon(index, True)
+        self._clear_openings()
+
+    def _clear_openings(self):
+        """
+        Forgets the opening index once pokemons have moved - it is built again
+        when an opening is next revealed
+        """
+        self._opening_of = None
+        self._opening_cells = None
+        self._opening_bounds = None
+
+    def _set_pokemon(self, index, hidden):
+        """
+        Adds or removes a pokemon at index and updates the numbers of the cells
+        around it
+
+        Parameters:
+            index (int): index corresponding to game string
+            hidden (bool): True if a pokemon is hidden at index after the update
+        """
+        adjacent = self._adjacent
+        # pokemon locations loaded from a file may repeat an index
+        if bool(adjacent[index] & _POKEMON_BIT) == hidden:
+            return
+        adjacent[index] ^= _POKEMON_BIT
+        change = 1 if hidden else -1
+        self._num_hidden += change
+        cell_edges, edge_offsets = neighbour_table(self._grid_size)
+        for offset in edge_offsets[cell_edges[index]]:
+            adjacent[index + offset] += change
+
+    def _count_cells(self):
+        """
+        Recounts the running totals used by check_win, check_loss and the
+        pokeball counts from the whole board
+        """
+        self._num_revealed = sum(map(self._cells.count, REVEALED.encode("ascii")))
+        self._num_flags = self._cells.count(_FLAG_BYTE)
+        self._num_caught = 0
+        self._num_pokemon_revealed = 0
+        for index in self.get_pokemon_locations():
+            if self._cells[index] == _FLAG_BYTE:
+                self._num_caught += 1
+            elif self._cells[index] in _DIGIT_BYTES:
+                self._num_pokemon_revealed += 1
+
+    def _track_cell(self, index, change):
+        """
+        Adds (change=1) or removes (change=-1) a cell from the running totals.
+        Called with -1 before a cell changes and with 1 after it has changed
+
+        Parameters:
+            index (int): index corresponding to game string
+            change (int): 1 or -1 depending on whether cell is counted or uncounted
+        """
+        byte = self._cells[index]
+        if byte in _DIGIT_BYTES:
+            self._num_revealed += change
+            if self._adjacent[index] & _POKEMON_BIT:
+                self._num_pokemon_revealed += change
+        elif byte == _FLAG_BYTE:
+            self._num_flags += change
+            if self._adjacent[index] & _POKEMON_BIT:
+                self._num_caught += change
+
+    def get_num_attempted_catches(self):
+        """
+        (int) Returns number of pokeballs currently placed on board
+        """
+        return self._num_flags
+
+    def get_grid_size(self):
+        """
+        (int) Returns grid size of game
+        """
+        return self._grid_size
+
+    def get_num_pokemon(self):
+        """
+        (int) Returns number of pokemons hidden in game
+        """
+        return self._num_pokemon
+
+    def get_game(self):
+        """
+        (str) Returns the status of game string that represents each tile on game
+        board
+        """
+        # the string is only rebuilt after cells have changed
+        if self._game is None:
+            self._game = self._cells.decode("ascii").translate(_FROM_STORED)
+        return self._game
+
+    def get_cell(self, index):
+        """
+        (str) Returns the game character of a single cell without building the
+        whole game string
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        return _BYTE_TO_CHAR[self._cells[index]]
+
+    def check_loss(self):
+        """
+        (bool) Returns True if and only if game is lost, else will be False
+        """
+        return self._num_pokemon_revealed > 0
+
+    def check_win(self):
+        """
+        (bool) Checks if player has won game by looking into all cell status of game string
+
+        """
+        non_pokemon_cell = len(self._cells) - self._num_hidden
+        if (self._num_revealed == non_pokemon_cell
+                and self._num_caught == self._num_hidden):
+            return True
+        else:
+            return False
+        
+    def index_to_position(self, index):
+        """
+        (tuple<int, int>) Returns (row, col) coordinate corresponding to supplied index
+
+        Paramters:
+            index (int): index corresponding to game string
+        """
+        row = index // self._grid_size
+        col = index % self._grid_size
+        coordinate = (row, col)
+        return coordinate
+
+    def position_to_index(self, position):
+        """
+        (int) Returns index corresponding to coordinate inputted
+
+        Paramters:
+            positio (tuple): tuple corresponding to position of tile on game board
+        """
+        index = position[1] + position[0]*self._grid_size
+        return index
+
+    def replace_character_at_index(self, index, character):
+        """
+        Replaces game string with specified character placed at the specified index
+        anad returns it
+
+        Parameters:
+            game (str): A string of all relevant game character 
+            index (int): The index position in game string that will be updated
+            character (str): The character that will be used to update a specific game string
+        """
+        self._track_cell(index, -1)
+        self._cells[index] = _CHAR_TO_BYTE[character]
+        self._track_cell(index, 1)
+        self._game = None
+
+    def flag_cell(self, index):
+        """
+        Toggles the flag at the specified index in game string and updates it
+
+        Parameters:
+            game (string): A string of all relevant game character 
+            index (int): The index position in game string that will be updated 
+        """
+        before = self._cells[index]
+        self._track_cell(index, -1)
+        if self._cells[index] == _CHAR_TO_BYTE[UNEXPOSED]:
+            self._cells[index] = _FLAG_BYTE
+        elif self._cells[index] == _FLAG_BYTE:
+            self._cells[index] = _CHAR_TO_BYTE[UNEXPOSED]
+        self._track_cell(index, 1)
+        self._game = None
+        if self._cells[index] != before:
+            self._record([index], bytes([before]))
+
+    def expose_pokemons(self):
+        """
+        (tuple<int>) Shows every hidden pokemon once game is over and returns
+        their indexes. Cells it changes are added to the latest reveal or flag
+        in history, so undoing the move that ended game hides them again
+        """
+        pokemon_locations = self.get_pokemon_locations()
+        before = self._cells_at(pokemon_locations)
+        for index in pokemon_locations:
+            self.replace_character_at_index(index, POKEMON)
+        if self._undo:
+            indexes, move_before, move_after = self._undo[-1]
+            indexes.extend(pokemon_locations)
+            self._undo[-1] = (indexes, move_before + before,
+                              move_after + self._cells_at(pokemon_locations))
+        return pokemon_locations
+
+    def can_undo(self):
+        """
+        (bool) Returns True if there is a reveal or flag in history to undo
+        """
+        return bool(self._undo)
+
+    def can_redo(self):
+        """
+        (bool) Returns True if there is an undone reveal or flag to redo
+        """
+        return bool(self._redo)
+
+    def undo(self):
+        """
+        (list<int>) Takes back the latest reveal or flag in history and returns
+        indexes of every cell that changed - empty if there is nothing to undo.
+        Only the cells the move changed are written back, so undoing an opening
+        costs as much as the opening did. Pokemons placed by a safe first click
+        stay where they are
+        """
+        if not self._undo:
+            return []
+        move = self._undo.pop()
+        indexes, before, _ = move
+        # a cell can be changed twice in one move (a pokemon revealed and then
+        # exposed) so cells are written back last change first
+        self._write_cells(indexes[::-1], before[::-1])
+        if self._redo is None:
+            self._redo = []
+        self._redo.append(move)
+        return list(indexes)
+
+    def redo(self):
+        """
+        (list<int>) Plays the latest undone reveal or flag again and returns
+        indexes of every cell that changed - empty if there is nothing to redo
+        """
+        if not self._redo:
+            return []
+        move = self._redo.pop()
+        indexes, _, after = move
+        self._write_cells(indexes, after)
+        self._undo.append(move)
+        return list(indexes)
+
+    def clear_history(self):
+        """
+        Forgets every move that could be undone or redone - used when the
+        whole board is replaced
+        """
+        self._undo = None
+        self._redo = None
+
+    def _record(self, indexes, before):
+        """
+        Adds a move to undo history as the cells it changed with their stored
+        bytes before and after it. The oldest move is forgotten once history is
+        deeper than history depth, and undone moves can no longer be redone
+
+        Parameters:
+            indexes (list<int>): indexes of cells changed by move
+            before (bytes): stored byte of each cell before move
+        """
+        if not self._history_depth:
+            return
+        if self._undo is None:
+            self._undo = []
+        self._undo.append((array("I", indexes), before, self._cells_at(indexes)))
+        if len(self._undo) > self._history_depth:
+            del self._undo[0]
+        self._redo = None
+
+    def _write_cells(self, indexes, values):
+        """
+        Writes stored bytes to cells, keeping running totals up to date
+
+        Parameters:
+            indexes (sequence<int>): indexes of cells written
+            values (sequence<int>): stored byte written to each cell
+        """
+        cells = self._cells
+        if len(indexes) > len(cells) // 8:
+            # big moves are written as they are and the totals recounted once
+            for index, value in zip(indexes, values):
+                cells[index] = value
+            self._count_cells()
+        else:
+            for index, value in zip(indexes, values):
+                self._track_cell(index, -1)
+                cells[index] = value
+                self._track_cell(index, 1)
+        self._game = None
+
+    def generate_pokemons(self, grid_size, number_of_pokemons, safe_cells=()):
+        """
+        (tuple<int>) Pokemons will be generated and given a random index within the
+        game. Indexes are sampled without replacement from the board's random
+        number generator, or from a new one made from the board's seed, so the
+        same seed always gives the same locations
+
+        Parameters:
+            grid_size (int): The grid size of the game.
+            number_of_pokemons (int): The number of pokemons that the game will
+            have.
+            safe_cells (list<int>): Indexes that will never be given a pokemon
+        """
+        cell_count = grid_size ** 2
+        safe_cells = sorted(set(safe_cells))
+        free_count = cell_count - len(safe_cells)
+        rng = self._rng if self._rng is not None else random.Random(self._seed)
+        pokemon_locations = rng.sample(range(free_count),
+                                       max(0, min(number_of_pokemons, free_count)))
+
+        # samples are taken from the cells that are not safe so each one is
+        # shifted past the safe cells that come before it
+        if safe_cells:
+            for position, index in enumerate(pokemon_locations):
+                for safe_cell in safe_cells:
+                    if safe_cell > index:
+                        break
+                    index += 1
+                pokemon_locations[position] = index
+        return tuple(pokemon_locations)
+
+    def _place_pokemons_around(self, index):
+        """
+        Places pokemons that were held back until the first click. The clicked
+        cell is kept free of pokemons and so are its neighbours when there are
+        enough other cells left for every pokemon
+
+        Parameters:
+            index (int): Index of the first cell revealed
+        """
+        safe_cells = [index] + self.neighbour_directions(index, self._grid_size)
+        if len(self._cells) - len(safe_cells) < self._num_pokemon:
+            safe_cells = [index]
+        self._placement_pending = False
+        self.set_pokemon_locations(self.generate_pokemons(self._grid_size,
+                                                          self._num_pokemon, safe_cells))
+            
+    def index_in_direction(self, index, grid_size, direction):
+        """
+        (int) Takes index to a cell in the game string and returns a new index
+        corresponding to an adjacent cell in the specified direction and will
+        return None if it goes out of game board boundaries
+
+        Parameters:
+            index (int): The index position in game string that is relevant for specified direction
+            grid_size (int): Grid size of the game
+            direction (str): Direction of intended movement
+        """
+        if direction not in _DIRECTION_STEPS:
+            return None
+        row_step, col_step, blocked_by = _DIRECTION_STEPS[direction]
+        cell_edges, _ = neighbour_table(grid_size)
+
+        # cells on the edges of the grid cannot move towards that edge
+        if cell_edges[index] & blocked_by:
+            return None
+        return index + row_step*grid_size + col_step
+
+    def neighbour_directions(self, index, grid_size):
+        """
+        (list<int>) Returns a list of indexes that have a neighbouring cell
+        (excluding the boundaries).
+
+        Parameters:
+            index (int): The index position in game string 
+            grid_size (int): Grid size of the game
+        """
+        cell_edges, edge_offsets = neighbour_table(grid_size)
+        return [index + offset for offset in edge_offsets[cell_edges[index]]]
+
+    def number_at_cell(self, game, pokemon_locations, grid_size, index):
+        """
+        (int) Would check the number of pokemon in neighbouring cells and output an
+        integer of that particular cell. Numbers are counted once when pokemons
+        are placed so this is only a look up
+
+        Parameters:
+            game (str): Used to check if there are already any exposed cell in game string
+            grid_size (int): Grid size of the game
+            index (int): This would be the relevant cell that will be checked to see number of pokemon around it
+            pokemon_locations (tuple <int,...>): Random pokemon locations which is given as index number corresponding to position in game string
+        """
+        return self._adjacent[index] & _COUNT_MASK
+
+    def big_fun_search(self, game , grid_size, pokemon_locations, index):
+        """
+        (list<int>) Searching adjacent cells to see if there are any Pokemon"s
+        present. Find all cells which should be revealed when a cell is selected.
+        For cells which have a zero value (i.e. no neighbouring pokemons) all the
+        cell"s neighbours are revealed. If one of the neighbouring cells is also
+        zero then all of that cell"s neighbours are also revealed. This repeats
+        until no zero value neighbours exist.
+        For cells which have a non-zero value (i.e. cells with neightbour pokemons)
+        , only the cell itself is revealed.
+
+        Parameters:
+            game (str): Game string.
+            grid_size (int): Size of game.
+            pokemon_locations (tuple<int, ...>): Tuple of all Pokemon's locations.
+            index (int): Index of the currently selected cell
+        """
+        if self._cells[index] == _FLAG_BYTE:
+                return [index]
+
+        number = self.number_at_cell(game, pokemon_locations, grid_size, index)
+        if number != 0:
+                return [index]
+        return self._opening(index)
+
+    def reveal_cell(self, index):
+        """
+        (list<int>) Reveals the number of the cell at index. When the cell has no
+        neighbouring pokemons the whole opening around it is revealed in the
+        same call. Flagged and already revealed cells are left as they are.
+        Returns indexes of every cell that was revealed
+
+        Parameters:
+            index (int): Index of the currently selected cell
+        """
+        if self._cells[index] == _FLAG_BYTE or self._cells[index] in _DIGIT_BYTES:
+            return []
+        if self._placement_pending:
+            self._place_pokemons_around(index)
+        before = self._cells[index]
+        revealed = []
+        self._reveal_area(index, revealed)
+        # every cell of an opening was unexposed before it was revealed
+        self._record(revealed, bytes([before]) + bytes([_UNEXPOSED_BYTE]) * (len(revealed) - 1))
+        return revealed
+
+    def chord_cell(self, index):
+        """
+        (list<int>) Reveals every unexposed neighbour of a revealed number once
+        as many pokeballs as the number are placed around it, together with
+        the openings they lead to, as one move. Returns indexes of every cell
+        that was revealed - none if the cell is not a number or the pokeballs
+        around it do not match it
+
+        Parameters:
+            index (int): Index of the currently selected cell
+        """
+        number = self._cells[index]
+        if number not in _DIGIT_BYTES:
+            return []
+        cell_edges, edge_offsets = neighbour_table(self._grid_size)
+        neighbours = [index + offset for offset in edge_offsets[cell_edges[index]]]
+        flags = sum(1 for neighbour in neighbours if self._cells[neighbour] == _FLAG_BYTE)
+        if flags != number - _DIGIT_BYTE_ZERO:
+            return []
+        revealed = []
+        for neighbour in neighbours:
+            # an opening from an earlier neighbour may have reached this one
+            if self._cells[neighbour] == _UNEXPOSED_BYTE:
+                self._reveal_area(neighbour, revealed)
+        if revealed:
+            self._record(revealed, bytes([_UNEXPOSED_BYTE]) * len(revealed))
+        return revealed
+
+    def _reveal_area(self, index, revealed):
+        """
+        Reveals the number of an unexposed cell and, when it has no neighbouring
+        pokemons, the whole opening around it
+
+        Parameters:
+            index (int): index corresponding to game string
+            revealed (list<int>): indexes of revealed cells get appended to it
+        """
+        self._reveal_number(index)
+        revealed.append(index)
+
+        # cells hiding a pokemon never count as having no neighbouring pokemons
+        if self._adjacent[index] == 0:
+            opening = self._indexed_opening(index)
+            if opening is None:
+                self._reveal_runs(self._opening_runs(index), revealed)
+            else:
+                for cell in opening:
+                    if self._cells[cell] == _UNEXPOSED_BYTE:
+                        self._reveal_number(cell)
+                        revealed.append(cell)
+
+    def _reveal_number(self, index):
+        """
+        Replaces cell at index with the number of its neighbouring pokemons
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        self._track_cell(index, -1)
+        self._cells[index] = _DIGIT_BYTE_ZERO + (self._adjacent[index] & _COUNT_MASK)
+        self._track_cell(index, 1)
+        self._game = None
+
+    def _reveal_runs(self, runs, revealed):
+        """
+        Reveals every unexposed cell inside the runs of an opening. Runs that
+        are still completely unexposed are written with a single slice
+
+        Parameters:
+            runs (list<tuple<int, int>>): (start, stop) index ranges of cells
+            revealed (list<int>): indexes of revealed cells get appended to it
+        """
+        for start, stop in runs:
+            hidden = self._cells.count(_UNEXPOSED_BYTE, start, stop)
+            if hidden == stop - start:
+                self._cells[start:stop] = self._adjacent[start:stop].translate(_COUNT_TO_DIGIT)
+                revealed.extend(range(start, stop))
+            elif hidden:
+                for cell in range(start, stop):
+                    if self._cells[cell] == _UNEXPOSED_BYTE:
+                        self._cells[cell] = _DIGIT_BYTE_ZERO + (self._adjacent[cell] & _COUNT_MASK)
+                        revealed.append(cell)
+            # cells around an opening can never be hiding a pokemon
+            self._num_revealed += hidden
+        self._game = None
+
+    def _opening(self, index):
+        """
+        (list<int>) Returns every cell (other than index) that is reached by
+        spreading out from index through cells with no neighbouring pokemons,
+        together with the numbered cells bordering them. Flagged cells are
+        included but the search does not spread through them
+
+        Parameters:
+            index (int): Index of a cell with no neighbouring pokemons
+        """
+        opening = self._indexed_opening(index)
+        if opening is None:
+            opening = [cell for start, stop in self._opening_runs(index)
+                       for cell in range(start, stop)]
+        return [cell for cell in opening if cell != index]
+
+    def _indexed_opening(self, index):
+        """
+        (array<int>) Returns cells of the opening at index (including index) from
+        the opening index, or None when the opening has to be searched because
+        the board is not indexed or a flag has been placed inside the opening
+
+        Parameters:
+            index (int): Index of a cell with no neighbouring pokemons
+        """
+        if self._opening_of is None:
+            if not _MIN_INDEXED_OPENING_CELLS <= len(self._cells) <= _INDEXED_OPENING_CELLS:
+                return None
+            self._index_openings()
+        label = self._opening_of[index]
+        if not label:
+            return None
+        # cells of each opening are followed by the cells bordering it
+        start, border, stop = self._opening_bounds[2*label - 2:2*label + 1]
+        if _FLAG_BYTE in self._cells_at(self._opening_cells[start:border]):
+            return None
+        return self._opening_cells[start:stop]
+
+    def _opening_runs(self, index):
+        """
+        (list<tuple<int, int>>) Searches the opening at index a row run at a time
+        and returns (start, stop) index ranges covering the opening and the
+        cells bordering it, without any cell appearing twice. Rows are searched
+        with bytes methods so openings of millions of cells stay quick
+
+        Parameters:
+            index (int): Index of a cell with no neighbouring pokemons
+        """
+        grid_size = self._grid_size
+        passable_rows = {}
+
+        def passable(row):
+            # 1 for unflagged cells with no neighbouring pokemons, 0 otherwise
+            if row not in passable_rows:
+                start = row*grid_size
+                stop = start + grid_size
+                passable_rows[row] = (
+                    int.from_bytes(self._adjacent[start:stop].translate(_IS_ZERO), "little")
+                    & int.from_bytes(self._cells[start:stop].translate(_IS_NOT_FLAG), "little")
+                    ).to_bytes(grid_size, "little")
+            return passable_rows[row]
+
+        def run_around(cells, col):
+            stop = cells.find(b"\0", col)
+            return cells.rfind(b"\0", 0, col) + 1, stop if stop >= 0 else grid_size
+
+        row, col = divmod(index, grid_size)
+        start, stop = run_around(passable(row), col) if passable(row)[col] else (col, col+1)
+        queue = [(row, start, stop)]
+        searched = {(row, start)}
+        visible = {}
+        while queue:
+            row, start, stop = queue.pop()
+            low = max(start-1, 0)
+            high = min(stop+1, grid_size)
+            for near in (row-1, row, row+1):
+                if not 0 <= near < grid_size:
+                    continue
+                visible.setdefault(near, []).append((low, high))
+                if near == row:
+                    continue
+                # runs in the rows above and below that touch this run (including
+                # diagonally) are part of the same opening
+                cells = passable(near)
+                col = cells.find(b"\1", low, high)
+                while col >= 0:
+                    run_start, run_stop = run_around(cells, col)
+                    if (near, run_start) not in searched:
+                        searched.add((near, run_start))
+                        queue.append((near, run_start, run_stop))
+                    col = cells.find(b"\1", run_stop, high)
+
+        runs = []
+        for row, spans in visible.items():
+            spans.sort()
+            merged_start, merged_stop = spans[0]
+            for start, stop in spans:
+                if start > merged_stop:
+                    runs.append((row*grid_size + merged_start, row*grid_size + merged_stop))
+                    merged_start = start
+                merged_stop = max(merged_stop, stop)
+            runs.append((row*grid_size + merged_start, row*grid_size + merged_stop))
+        return runs
+
+    def _cells_at(self, indexes):
+        """
+        (bytes) Returns the stored cell bytes at each of the indexes
+
+        Parameters:
+            indexes (list<int>): indexes corresponding to game string
+        """
+        cells = self._cells
+        return bytes([cells[index] for index in indexes])
+
+    def _index_openings(self):
+        """
+        Groups every cell with no neighbouring pokemons into openings with a
+        union find over the grid. Each opening keeps its cells and the numbered
+        cells bordering it so a click can reveal it without searching. Openings
+        are labelled from 1 in _opening_of (0 for cells outside openings) and
+        their cells are packed one after another in _opening_cells, with
+        _opening_bounds giving where the cells, border and next opening start
+        """
+        cell_count = len(self._cells)
+        cell_edges, edge_offsets = neighbour_table(self._grid_size)
+        zero_cells = [index for index in range(cell_count) if self._adjacent[index] == 0]
+        is_zero = bytearray(cell_count)
+        for index in zero_cells:
+            is_zero[index] = 1
+
+        # roots are always the smallest index of their opening
+        parent = array("i", range(cell_count))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for index in zero_cells:
+            for offset in edge_offsets[cell_edges[index]]:
+                neighbour = index + offset
+                if offset > 0 and is_zero[neighbour]:
+                    root, other = find(index), find(neighbour)
+                    if root != other:
+                        parent[max(root, other)] = min(root, other)
+
+        opening_of = array("H", [0]) * cell_count
+        openings = []
+        for index in zero_cells:
+            root = find(index)
+            if root == index:
+                openings.append([])
+                opening_of[index] = len(openings)
+            else:
+                opening_of[index] = opening_of[root]
+            openings[opening_of[index] - 1].append(index)
+
+        # numbered cells can border an opening many times but are kept once
+        bordered_by = array("i", [0]) * cell_count
+        opening_cells = array("H")
+        opening_bounds = array("I")
+        for label, zeros in enumerate(openings, 1):
+            opening_bounds.append(len(opening_cells))
+            opening_cells.extend(zeros)
+            opening_bounds.append(len(opening_cells))
+            for index in zeros:
+                for offset in edge_offsets[cell_edges[index]]:
+                    neighbour = index + offset
+                    if not is_zero[neighbour] and bordered_by[neighbour] != label:
+                        bordered_by[neighbour] = label
+                        opening_cells.append(neighbour)
+        opening_bounds.append(len(opening_cells))
+
+        self._opening_of = opening_of
+        self._opening_cells = opening_cells
+        self._opening_bounds = opening_bounds
+
+    def restart_game_string(self):
+        """
+        (int) This will restart all elements in game string but maintain hidden
+        pokemon locations
+        """
+        self._cells = bytearray([_CHAR_TO_BYTE[UNEXPOSED]]) * self._grid_size*self._grid_size
+        self._game = None
+        self._count_cells()
+        self.clear_history()
+
+    def get_num_pokeball_left(self):
+        """
+        Acquires the number of pokeballs left for players
+        """
+        return self.get_num_pokemon() - self.get_num_attempted_catches()
+
+    def get_cell_codes(self):
+        """
+        (bytes) Returns state of every cell as a code - numbers of revealed
+        cells are their own code, other cells are UNEXPOSED_CODE, FLAG_CODE
+        or POKEMON_CODE
+        """
+        return bytes(self._cells).translate(_STORED_TO_CODE)
+
+    def set_game_settings_open(self, pokemon_num, pokemon_loc, game_string, grid_size):
+        """
+        This will ensure the following settings would follow settings of file loaded:
+        number of pokemons in game, pokemon location and game string
+
+        Parameters:
+            pokemon_num (int): Previous game data's of number of pokemons
+            pokemon_loc (tuple): Previous game data's of location of pokemons
+            game_string (str|bytes): Previous game data's of game string, or
+            its cell codes (see get_cell_codes) when loaded from a binary save
+            grid_size (int): Previous game data's of grid size
+
+        Raises ValueError (leaving board as it was) if game string does not
+        have grid_size^2 cells or a pokemon location is off board
+        """
+        cell_count = grid_size*grid_size
+        if len(game_string) != cell_count:
+            raise ValueError("game string must have grid_size^2 cells")
+        if not all(0 <= index < cell_count for index in pokemon_loc):
+            raise ValueError("pokemon locations must be between 0 and grid_size^2 - 1")
+        if isinstance(game_string, str):
+            self._cells = bytearray(game_string.translate(_TO_STORED), "ascii")
+        else:
+            self._cells = bytearray(game_string).translate(_CODE_TO_STORED)
+        self._game = None
+        self._placement_pending = False
+        self._num_pokemon = pokemon_num
+        self._grid_size = grid_size
+        self._count_adjacent(pokemon_loc)
+        self._count_cells()
+        self.clear_history()
@@ -0,0 +1,238 @@
+# Headless game engine of A3 Pokemon Game - the rules of a whole game on top of
+# BoardModel without tkinter or PIL, so games can be played by simulations,
+# servers and benchmarks as well as by the GUI
+
+from board_model import BoardModel, FLAG, UNEXPOSED
+
+# CONSTANTS
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+
+class PokemonEngine(object):
+    """
+    Plays a game of Pokemon on a BoardModel
+    """
+    __slots__ = ("_grid_size", "_num_pokemon", "_limit_pokeballs", "_safe_first_click",
+                 "_history_depth", "_model", "_state", "_redo_states")
+
+    def __init__(self, grid_size=10, num_pokemon=3, limit_pokeballs=True,
+                 safe_first_click=False, seed=None, history_depth=0):
+        """
+        Applies rules of game (revealing, losing, winning and the pokeball
+        budget) to a board model. It has no GUI and is driven by cell indexes
+
+        Parameters:
+            grid_size (int): the size of the grid used
+            num_pokemon (int): number of hidden pokemon involved
+            limit_pokeballs (bool): True if no more pokeballs can be placed than
+            there are pokemons in game
+            safe_first_click (bool): first cell revealed never has a pokemon in
+            or around it
+            seed (int): seed of the first game's pokemon locations
+            history_depth (int): number of moves that can be undone, none if 0
+        """
+        self._grid_size = grid_size
+        self._num_pokemon = num_pokemon
+        self._limit_pokeballs = limit_pokeballs
+        self._safe_first_click = safe_first_click
+        self._history_depth = history_depth
+        self._model = None
+        self._state = PLAYING
+        # state each undone move left game in, latest undone move last - only
+        # made once a move is undone
+        self._redo_states = None
+        self.new_game(seed=seed)
+
+    def get_model(self):
+        """
+        (BoardModel) Returns board model of game currently played
+        """
+        return self._model
+
+    def get_limit_pokeballs(self):
+        """
+        (bool) Returns True if no more pokeballs can be placed than there are pokemons
+        """
+        return self._limit_pokeballs
+
+    def get_safe_first_click(self):
+        """
+        (bool) Returns True if first cell revealed never has a pokemon in or around it
+        """
+        return self._safe_first_click
+
+    def new_game(self, grid_size=None, num_pokemon=None, seed=None, rng=None):
+        """
+        (BoardModel) Starts new game with new pokemon locations and returns its
+        board model
+
+        Parameters:
+            grid_size (int): grid size of new game, the current one if None
+            num_pokemon (int): number of pokemons of new game, the current one if None
+            seed (int): seed of the pokemon locations
+            rng (random.Random): random number generator used to place pokemons
+        """
+        if grid_size is not None:
+            self._grid_size = grid_size
+        if num_pokemon is not None:
+            self._num_pokemon = num_pokemon
+        self._model = BoardModel(self._grid_size, self._num_pokemon, seed=seed, rng=rng,
+                                 safe_first_click=self._safe_first_click,
+                                 history_depth=self._history_depth)
+        self._state = PLAYING
+        self._redo_states = None
+        return self._model
+
+    def restart_game(self):
+        """
+        Restarts game while keeping the same pokemon locations
+        """
+        self._model.restart_game_string()
+        self._state = PLAYING
+        self._redo_states = None
+
+    def load_game(self, pokemon_num, pokemon_loc, game_string, grid_size):
+        """
+        Continues a previous game from its saved settings
+
+        Parameters:
+            pokemon_num (int): Previous game data's of number of pokemons
+            pokemon_loc (tuple): Previous game data's of location of pokemons
+            game_string (str): Previous game data's of game string
+            grid_size (int): Previous game data's of grid size
+        """
+        self._model.set_game_settings_open(pokemon_num, pokemon_loc, game_string, grid_size)
+        self._grid_size = grid_size
+        self._num_pokemon = pokemon_num
+        self._state = PLAYING
+        self._redo_states = None
+
+    def reveal(self, index):
+        """
+        (list<int>) Reveals the cell at index (and the opening around it) and
+        returns indexes of every cell that changed. Revealing a pokemon loses
+        the game and revealing the last safe cell can win it - either way all
+        pokemons are exposed
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        if self._state != PLAYING:
+            return []
+        return self._end_reveal(self._model.reveal_cell(index))
+
+    def chord(self, index):
+        """
+        (list<int>) Reveals every unexposed neighbour of the revealed number at
+        index (and the openings around them) when as many pokeballs as the
+        number are placed around it, and returns indexes of every cell that
+        changed. Game is won or lost as for a reveal, checked once for the
+        whole chord
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        if self._state != PLAYING:
+            return []
+        return self._end_reveal(self._model.chord_cell(index))
+
+    def flag(self, index):
+        """
+        (list<int>) Places or takes back a pokeball at index and returns indexes
+        of every cell that changed. No pokeball is placed when none are left
+        and pokeballs are limited
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        if self._state != PLAYING:
+            return []
+        cell = self._model.get_cell(index)
+        if cell not in (FLAG, UNEXPOSED):
+            return []
+        if (cell == UNEXPOSED and self._limit_pokeballs
+                and self._model.get_num_pokeball_left() <= 0):
+            return []
+        self._model.flag_cell(index)
+        changed = [index]
+        self._redo_states = None
+
+        if self._model.check_win():
+            self._state = WON
+            changed.extend(self._expose_pokemons())
+        return changed
+
+    def undo(self):
+        """
+        (list<int>) Takes back the latest reveal or flag, hiding pokemons again
+        if it ended game, and returns indexes of every cell that changed
+        """
+        changed = self._model.undo()
+        if changed:
+            if self._redo_states is None:
+                self._redo_states = []
+            self._redo_states.append(self._state)
+            # no move is played once game is over so every earlier move left
+            # game playing
+            self._state = PLAYING
+        return changed
+
+    def redo(self):
+        """
+        (list<int>) Plays the latest undone move again and returns indexes of
+        every cell that changed
+        """
+        changed = self._model.redo()
+        if changed:
+            self._state = self._redo_states.pop()
+        return changed
+
+    def status(self):
+        """
+        (dict) Returns state of game (PLAYING, WON or LOST) together with the
+        pokeball counts shown to players
+        """
+        return {
+            "state": self._state,
+            "grid_size": self._grid_size,
+            "num_pokemon": self._model.get_num_pokemon(),
+            "attempted_catches": self._model.get_num_attempted_catches(),
+            "pokeballs_left": self._model.get_num_pokeball_left()
+            }
+
+    def snapshot(self):
+        """
+        (dict) Returns everything needed to continue game later - the status
+        of game together with its game string and pokemon locations
+        """
+        snapshot = self.status()
+        snapshot["game"] = self._model.get_game()
+        snapshot["pokemon_locations"] = self._model.get_pokemon_locations()
+        return snapshot
+
+    def _end_reveal(self, changed):
+        """
+        (list<int>) Checks whether revealed cells won or lost game, exposing all
+        pokemons if so, and returns indexes of every cell that changed
+
+        Parameters:
+            changed (list<int>): indexes of cells revealed
+        """
+        if changed:
+            self._redo_states = None
+
+        if changed and self._model.check_loss():
+            self._state = LOST
+            changed.extend(self._expose_pokemons())
+        elif self._model.check_win():
+            self._state = WON
+            changed.extend(self._expose_pokemons())
+        return changed
+
+    def _expose_pokemons(self):
+        """
+        (tuple<int>) Shows every hidden pokemon on board once game is over and
+        returns their indexes
+        """
+        return self._model.expose_pokemons()
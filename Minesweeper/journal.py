@@ -0,0 +1,285 @@
+# Move journal of A3 Pokemon Game - autosaves a game by appending every move
+# to a journal file, folding the journal into a binary save file (snapshot)
+# every so often, so a game can be rebuilt after a crash from its last
+# snapshot and the moves made since
+#
+# Files in the journal directory are numbered by snapshot:
+#   snapshot-<n>.pkb - binary save file (see save_file.py) of snapshot n
+#   journal-<n>.log  - moves made after snapshot n, one _MOVE record each
+# Writing happens on a background thread so moves never wait on the disk
+
+import atexit
+import os
+import queue
+import struct
+import threading
+
+from time import time, monotonic
+from save_file import encode_binary_save, read_binary_save
+
+# CONSTANTS
+REVEAL_MOVE = "reveal"
+FLAG_MOVE = "flag"
+CHORD_MOVE = "chord"
+UNDO_MOVE = "undo"
+REDO_MOVE = "redo"
+# new moves go at the end so journals written before them still read back
+_MOVES = (REVEAL_MOVE, FLAG_MOVE, CHORD_MOVE, UNDO_MOVE, REDO_MOVE)
+# move (index in _MOVES), cell index and time the move was made
+_MOVE = struct.Struct("<BId")
+_SNAPSHOT_NAME = "snapshot-{}.pkb"
+_JOURNAL_NAME = "journal-{}.log"
+
+class MoveJournal(object):
+    """
+    Autosaves a game one move at a time
+    """
+    def __init__(self, directory, take_snapshot, compact_after=1000, sync_interval=1.0):
+        """
+        Moves are handed to a writer thread which appends them to the journal
+        file, buffered, and only forces them to disk (fsync) once every
+        sync_interval seconds. After compact_after moves the game is written
+        as a new snapshot and an empty journal is started
+
+        Parameters:
+            directory (str): directory journal files are kept in
+            take_snapshot (callable): returns a copy of the game as (grid_size,
+            pokemon_locations, cell_codes, elapsed_time, board_width) - called
+            on the thread moves are recorded on
+            compact_after (int): number of moves journaled before a snapshot
+            is taken
+            sync_interval (float): most seconds moves are kept before being
+            forced to disk
+        """
+        self._directory = directory
+        self._take_snapshot = take_snapshot
+        self._compact_after = compact_after
+        self._sync_interval = sync_interval
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_number = max(_numbered_files(directory), default=0)
+        self._moves_journaled = 0
+        # journaled moves since the latest snapshot that can still be undone
+        # and undone ones that can still be redone
+        self._undoable = 0
+        self._redoable = 0
+        self._error = None
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write, name="MoveJournal", daemon=True)
+        self._thread.start()
+        # moves still queued when program exits are written before it ends
+        atexit.register(self.close)
+
+    def get_error(self):
+        """
+        (OSError) Returns error that stopped journal from writing, None if
+        journal is writing fine
+        """
+        return self._error
+
+    def record(self, move, index=0):
+        """
+        Journals a move that changed game - takes a snapshot instead once
+        compact_after moves have been journaled. An undo or redo is only
+        journaled when the move it takes back (or plays again) was journaled
+        after the latest snapshot, as replaying from that snapshot could not
+        undo it otherwise - a snapshot is taken instead
+
+        Parameters:
+            move (str): REVEAL_MOVE, FLAG_MOVE, CHORD_MOVE, UNDO_MOVE or REDO_MOVE
+            index (int): index of cell the move was made on, unused by undo and redo
+        """
+        if move == UNDO_MOVE:
+            if not self._undoable:
+                self.compact()
+                return
+            self._undoable -= 1
+            self._redoable += 1
+        elif move == REDO_MOVE:
+            if not self._redoable:
+                self.compact()
+                return
+            self._redoable -= 1
+            self._undoable += 1
+        else:
+            # a new move means undone moves can no longer be redone
+            self._undoable += 1
+            self._redoable = 0
+        self._moves_journaled += 1
+        if self._moves_journaled >= self._compact_after:
+            self.compact()
+        else:
+            self._queue.put(("move", _MOVE.pack(_MOVES.index(move), index, time())))
+
+    def compact(self):
+        """
+        Takes a snapshot of game - journaled moves are no longer needed once it
+        is written. Used after every move that replaces the board (new game,
+        restart and load) as well as when the journal gets long
+        """
+        self._moves_journaled = 0
+        self._undoable = 0
+        self._redoable = 0
+        self._snapshot_number += 1
+        self._queue.put(("snapshot", self._snapshot_number, self._take_snapshot()))
+
+    def clear(self):
+        """
+        Deletes every snapshot and journal - used once a game is over
+        """
+        self._moves_journaled = 0
+        self._undoable = 0
+        self._redoable = 0
+        self._queue.put(("clear",))
+
+    def close(self):
+        """
+        Writes every queued move and snapshot to disk and stops writer thread
+        """
+        if self._thread.is_alive():
+            self._queue.put(("close",))
+            self._thread.join()
+
+    def _write(self):
+        """
+        Writes queued moves and snapshots until journal is closed. Runs on the
+        writer thread
+        """
+        journal = None
+        last_sync = monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self._sync_interval)
+            except queue.Empty:
+                item = None
+            if item is not None and item[0] == "close":
+                if journal is not None:
+                    journal.close()
+                return
+            # a journal that cannot be written is given up rather than stopping
+            # game - writing on could pair moves with the wrong snapshot
+            if self._error is not None:
+                continue
+
+            try:
+                if item is not None and item[0] == "move":
+                    if journal is None:
+                        journal = open(self._path(_JOURNAL_NAME, self._written_number()), "ab")
+                    journal.write(item[1])
+                elif item is not None:
+                    if journal is not None:
+                        journal.close()
+                        journal = None
+                    if item[0] == "snapshot":
+                        self._write_snapshot(item[1], item[2])
+                    else:
+                        self._remove_older(None)
+
+                if journal is not None and monotonic() - last_sync >= self._sync_interval:
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                    last_sync = monotonic()
+            except OSError as error:
+                self._error = error
+
+    def _written_number(self):
+        """
+        (int) Returns number of newest snapshot on disk, 0 if there is none
+        """
+        return max(_numbered_files(self._directory), default=0)
+
+    def _write_snapshot(self, number, snapshot):
+        """
+        Writes snapshot file (under a temporary name first so a crash never
+        leaves half a snapshot) then removes older snapshots and journals
+
+        Parameters:
+            number (int): number of snapshot
+            snapshot (tuple): copy of game given by take_snapshot
+        """
+        path = self._path(_SNAPSHOT_NAME, number)
+        with open(path + ".tmp", "wb") as file:
+            file.write(encode_binary_save(*snapshot))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + ".tmp", path)
+        self._remove_older(number)
+
+    def _remove_older(self, number):
+        """
+        Removes snapshots and journals older than snapshot number
+
+        Parameters:
+            number (int): number of snapshot kept, every file is removed if None
+        """
+        for name in os.listdir(self._directory):
+            for pattern in (_SNAPSHOT_NAME, _JOURNAL_NAME):
+                file_number = _file_number(name, pattern)
+                if file_number is not None and (number is None or file_number < number):
+                    os.remove(os.path.join(self._directory, name))
+
+    def _path(self, name, number):
+        """
+        (str) Returns path of numbered file in journal directory
+
+        Parameters:
+            name (str): _SNAPSHOT_NAME or _JOURNAL_NAME
+            number (int): number of snapshot
+        """
+        return os.path.join(self._directory, name.format(number))
+
+def recover_journal(directory):
+    """
+    (dict) Returns game left in journal directory by last run - the settings of
+    its newest readable snapshot (see read_binary_save) with the moves made
+    since under "Moves" as (move, index, time) tuples. Returns None if there is
+    no game to recover
+
+    Parameters:
+        directory (str): directory journal files are kept in
+    """
+    if not os.path.isdir(directory):
+        return None
+    for number in sorted(_numbered_files(directory), reverse=True):
+        try:
+            settings = read_binary_save(os.path.join(directory, _SNAPSHOT_NAME.format(number)))
+        except (OSError, ValueError):
+            continue
+
+        settings["Moves"] = []
+        try:
+            with open(os.path.join(directory, _JOURNAL_NAME.format(number)), "rb") as file:
+                data = file.read()
+        except OSError:
+            return settings
+        # a move cut short by a crash is left out
+        end = len(data) - len(data) % _MOVE.size
+        for move, index, made in _MOVE.iter_unpack(data[:end]):
+            settings["Moves"].append((_MOVES[move], index, made))
+        return settings
+    return None
+
+def _file_number(name, pattern):
+    """
+    (int) Returns snapshot number in a file name made from pattern, None if
+    name is not made from pattern
+
+    Parameters:
+        name (str): file name
+        pattern (str): _SNAPSHOT_NAME or _JOURNAL_NAME
+    """
+    prefix, suffix = pattern.split("{}")
+    number = name[len(prefix):len(name) - len(suffix)]
+    if name.startswith(prefix) and name.endswith(suffix) and number.isdigit():
+        return int(number)
+    return None
+
+def _numbered_files(directory):
+    """
+    (set<int>) Returns numbers of the snapshots in directory
+
+    Parameters:
+        directory (str): directory journal files are kept in
+    """
+    numbers = (_file_number(name, _SNAPSHOT_NAME) for name in os.listdir(directory))
+    return {number for number in numbers if number is not None}
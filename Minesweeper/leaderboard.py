@@ -0,0 +1,157 @@
+# Leaderboard of A3 Pokemon Game - winning times kept in an SQLite database
+# file, ranked separately for every grid size and number of pokemons. Times
+# are indexed so top scores are read without going through the whole history,
+# and several games can write to the same file at once
+
+import sqlite3
+
+from time import time
+
+# CONSTANTS
+LEADERBOARD_FILE = "Highscore_data_A3.db"
+# text file high scores were kept in before the leaderboard
+TEXT_SCORES_FILE = "Highscore_data_A3.txt"
+LEADERBOARD_SIZE = 3
+# seconds a game waits for another game to finish writing
+LOCK_TIMEOUT = 10.0
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    grid_size INTEGER NOT NULL,
+    num_pokemon INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    time INTEGER NOT NULL,
+    recorded REAL NOT NULL,
+    PRIMARY KEY (grid_size, num_pokemon, name)
+);
+-- ties are ranked by who got there first
+CREATE INDEX IF NOT EXISTS scores_by_time ON scores (grid_size, num_pokemon, time, recorded);
+"""
+
+class Leaderboard(object):
+    """
+    Best winning times of every player, by game settings
+    """
+    def __init__(self, filename=LEADERBOARD_FILE, size=LEADERBOARD_SIZE):
+        """
+        Opens (or creates) the leaderboard database. Each player keeps only
+        their best time for each grid size and number of pokemons, and a time
+        is only recorded when it would make the top size times
+
+        Parameters:
+            filename (str): path of database file
+            size (int): number of places on the leaderboard
+        """
+        self._size = size
+        # transactions are begun by hand so a check and the write it leads to
+        # happen under one lock
+        self._connection = sqlite3.connect(filename, timeout=LOCK_TIMEOUT,
+                                           isolation_level=None)
+        # readers are never blocked by a game writing its score
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def get_size(self):
+        """
+        (int) Returns number of places on the leaderboard
+        """
+        return self._size
+
+    def top_scores(self, grid_size, num_pokemon, count=None):
+        """
+        (list<tuple<str, int>>) Returns (name, time in seconds) of the fastest
+        players for the game settings, fastest first
+
+        Parameters:
+            grid_size (int): the size of the grid used
+            num_pokemon (int): number of hidden pokemon involved
+            count (int): number of scores returned, size of leaderboard if None
+        """
+        return self._connection.execute(
+            "SELECT name, time FROM scores WHERE grid_size = ? AND num_pokemon = ?"
+            " ORDER BY time, recorded LIMIT ?",
+            (grid_size, num_pokemon, count or self._size)).fetchall()
+
+    def qualifies(self, grid_size, num_pokemon, seconds):
+        """
+        (bool) Returns True if a winning time would make the leaderboard for
+        the game settings
+
+        Parameters:
+            grid_size (int): the size of the grid used
+            num_pokemon (int): number of hidden pokemon involved
+            seconds (int): time taken to win in seconds
+        """
+        row = self._connection.execute(
+            "SELECT time FROM scores WHERE grid_size = ? AND num_pokemon = ?"
+            " ORDER BY time LIMIT 1 OFFSET ?",
+            (grid_size, num_pokemon, self._size - 1)).fetchone()
+        return row is None or seconds < row[0]
+
+    def add_score(self, name, grid_size, num_pokemon, seconds):
+        """
+        (bool) Records a winning time if it makes the leaderboard and beats the
+        player's own best. Returns True if the time was recorded
+
+        Parameters:
+            name (str): name of player
+            grid_size (int): the size of the grid used
+            num_pokemon (int): number of hidden pokemon involved
+            seconds (int): time taken to win in seconds
+        """
+        connection = self._connection
+        # other games wait here until this one has written its score
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            recorded = False
+            if self.qualifies(grid_size, num_pokemon, seconds):
+                cursor = connection.execute(
+                    "INSERT INTO scores (grid_size, num_pokemon, name, time, recorded)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (grid_size, num_pokemon, name) DO UPDATE"
+                    " SET time = excluded.time, recorded = excluded.recorded"
+                    " WHERE excluded.time < scores.time",
+                    (grid_size, num_pokemon, name, seconds, time()))
+                recorded = cursor.rowcount > 0
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return recorded
+
+    def import_text_scores(self, filename, grid_size, num_pokemon):
+        """
+        (int) Adds scores of a high score text file ("name: 01m 20s" lines) to
+        the game settings given, as those files did not keep settings, and
+        returns number of scores read. Lines that cannot be read are skipped
+
+        Parameters:
+            filename (str): path of high score text file
+            grid_size (int): the size of the grid used
+            num_pokemon (int): number of hidden pokemon involved
+        """
+        count = 0
+        with open(filename, "r") as file:
+            for line in file:
+                name, _, score = line.rpartition(":")
+                minutes_seconds = score.replace("m", "").replace("s", "").split()
+                if not name or len(minutes_seconds) != 2:
+                    continue
+                try:
+                    minutes, seconds = (int(number) for number in minutes_seconds)
+                except ValueError:
+                    continue
+                self.add_score(name, grid_size, num_pokemon, minutes*60 + seconds)
+                count += 1
+        return count
+
+    def is_empty(self):
+        """
+        (bool) Returns True if no score has been recorded for any settings
+        """
+        return self._connection.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is None
+
+    def close(self):
+        """
+        Closes the leaderboard database
+        """
+        self._connection.close()
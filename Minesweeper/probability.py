@@ -0,0 +1,554 @@
+# Probability engine of A3 Pokemon Game - the exact chance that each unexposed
+# cell hides a pokemon, given the revealed numbers, the pokeballs placed and
+# the number of pokemons in game. Used for hints and by the auto solver
+#
+# Numbered cells with unexposed neighbours (the frontier) are split into
+# groups that share no cells. Each group is counted exactly by going through
+# its cells in order and merging every partial placement that leaves the
+# constraints still open with the same counts (so a group costs the number of
+# distinct open counts, not 2**cells). Cells away from the frontier (interior)
+# are never enumerated - the pokemons left over are spread over them with
+# binomial weights
+#
+# Run "python probability.py" to time hints on 30x30 boards
+
+import argparse
+import math
+import random
+
+from collections import OrderedDict
+from operator import itemgetter
+from time import perf_counter
+from board_model import FLAG, POKEMON, UNEXPOSED, REVEALED, neighbour_table
+from engine import PokemonEngine, PLAYING
+
+# CONSTANTS
+# most cells kept by each cache - a position counts every cell of its board
+# and a frontier group its cells once for each number of pokemons it can hold,
+# so a few large boards cannot fill memory the way many small ones would not
+CACHE_CELLS = 250000
+DEFAULT_SETTINGS = ((30, 99), (30, 185))
+
+class ProbabilityEngine(object):
+    """
+    Exact pokemon probabilities of board positions
+    """
+    def __init__(self, cache_cells=CACHE_CELLS):
+        """
+        Answers are cached by position, and counts of each frontier group by
+        its constraints, so asking again after a move only counts the groups
+        the move changed. Positions larger than the cache are never cached
+
+        Parameters:
+            cache_cells (int): most cells kept by each cache
+        """
+        self._positions = _Cache(cache_cells)
+        self._groups = _Cache(cache_cells)
+
+    def get_probabilities(self, model):
+        """
+        (dict<int, float>) Returns the chance of a pokemon in every unexposed
+        cell of a board model. Pokeballs (and exposed pokemons) are taken to
+        be on pokemons. Raises ValueError if no placement of pokemons fits
+        what is shown on board
+
+        Parameters:
+            model (BoardModel): board model of game
+        """
+        game = model.get_game()
+        key = (model.get_grid_size(), model.get_num_pokemon(), game)
+        probabilities = self._positions.get(key)
+        if probabilities is None:
+            constraints, unexposed, pokemons_left = board_constraints(model)
+            frontier, interior_probability = self.frontier_probabilities(
+                constraints, unexposed, pokemons_left)
+            probabilities = {cell: frontier.get(cell, interior_probability)
+                             for cell in unexposed}
+            self._positions.put(key, probabilities, len(game))
+        return dict(probabilities)
+
+    def frontier_probabilities(self, constraints, unexposed, pokemons_left):
+        """
+        (tuple<dict<int, float>, float>) Returns the chance of a pokemon for
+        every frontier cell together with the chance of a pokemon in any
+        interior cell. Raises ValueError if no placement of pokemons fits the
+        constraints
+
+        Parameters:
+            constraints (list<tuple<frozenset<int>, int>>): cells around each
+            numbered cell and the pokemons still hidden among them
+            unexposed (list<int>): every unexposed cell on board
+            pokemons_left (int): number of pokemons without a pokeball on them
+        """
+        groups = []
+        for group in _components(constraints):
+            key = frozenset(group)
+            counted = self._groups.get(key)
+            if counted is None:
+                counted = count_group(group)
+                cells, ways = counted
+                self._groups.put(key, counted, len(cells) * max(1, len(ways)))
+            groups.append(counted)
+
+        frontier_size = sum(len(cells) for cells, _ in groups)
+        interior_size = len(unexposed) - frontier_size
+        interior_ways = {}
+
+        def interior(pokemons):
+            # ways of hiding the pokemons left over among interior cells
+            if pokemons not in interior_ways:
+                interior_ways[pokemons] = _comb(interior_size, pokemons)
+            return interior_ways[pokemons]
+
+        # ways over every group but one are the groups before it combined with
+        # the groups after it
+        before = [{0: 1}]
+        for _, ways in groups:
+            before.append(_convolve(before[-1], ways))
+        after = [{0: 1}]
+        for _, ways in reversed(groups):
+            after.append(_convolve(after[-1], ways))
+        after.reverse()
+
+        totals = before[-1]
+        weight = sum(count * interior(pokemons_left - used) for used, count in totals.items())
+        if weight == 0:
+            raise ValueError("no placement of pokemons fits the board")
+
+        probabilities = {}
+        for position, (cells, ways) in enumerate(groups):
+            others = _convolve(before[position], after[position + 1])
+            for used, (_, cell_counts) in ways.items():
+                rest = sum(count * interior(pokemons_left - used - other_used)
+                           for other_used, count in others.items())
+                if rest:
+                    for cell, cell_count in zip(cells, cell_counts):
+                        probabilities[cell] = probabilities.get(cell, 0) + cell_count * rest
+        probabilities = {cell: probabilities.get(cell, 0) / weight
+                         for cells, _ in groups for cell in cells}
+
+        interior_probability = 0.0
+        if interior_size:
+            interior_probability = sum(
+                count * interior(pokemons_left - used) * (pokemons_left - used)
+                for used, count in totals.items()) / weight / interior_size
+        return probabilities, interior_probability
+
+    def clear(self):
+        """
+        Forgets every cached answer
+        """
+        self._positions.clear()
+        self._groups.clear()
+
+class _Cache(object):
+    """
+    Least recently used values, kept up to a total size
+    """
+    def __init__(self, size):
+        """
+        Parameters:
+            size (int): most total size of values kept
+        """
+        self._size = size
+        self._used = 0
+        self._values = OrderedDict()
+
+    def get(self, key):
+        """
+        (object) Returns cached value of key (marking it as recently used),
+        None if it is not cached
+
+        Parameters:
+            key (object): key looked up
+        """
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        self._values.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        """
+        Caches value of key, forgetting least recently used values until the
+        total size fits. Values larger than the whole cache are not kept
+
+        Parameters:
+            key (object): key cached
+            value (object): value cached
+            size (int): size of value
+        """
+        if size > self._size:
+            return
+        if key in self._values:
+            self._used -= self._values.pop(key)[1]
+        self._values[key] = (value, size)
+        self._used += size
+        while self._used > self._size:
+            _, (_, old_size) = self._values.popitem(last=False)
+            self._used -= old_size
+
+    def clear(self):
+        """
+        Forgets every cached value
+        """
+        self._values.clear()
+        self._used = 0
+
+def board_constraints(model):
+    """
+    (tuple<list<tuple<frozenset<int>, int>>, list<int>, int>) Returns the
+    constraints of a board model (the unexposed cells around each numbered
+    cell and the pokemons still hidden among them), its unexposed cells and
+    the number of pokemons not known to be under a pokeball
+
+    Parameters:
+        model (BoardModel): board model of game
+    """
+    game = model.get_game()
+    cell_edges, edge_offsets = neighbour_table(model.get_grid_size())
+    known = FLAG + POKEMON
+    constraints = []
+    unexposed = []
+    for index, cell in enumerate(game):
+        if cell == UNEXPOSED:
+            unexposed.append(index)
+        elif cell in REVEALED:
+            cells = []
+            pokemon_num = int(cell)
+            for offset in edge_offsets[cell_edges[index]]:
+                neighbour = game[index + offset]
+                if neighbour == UNEXPOSED:
+                    cells.append(index + offset)
+                elif neighbour in known:
+                    pokemon_num -= 1
+            if cells:
+                constraints.append((frozenset(cells), pokemon_num))
+    known_pokemons = game.count(FLAG) + game.count(POKEMON)
+    return constraints, unexposed, model.get_num_pokemon() - known_pokemons
+
+def count_group(constraints):
+    """
+    (tuple<list<int>, dict<int, tuple<int, list<int>>>>) Counts every way of
+    hiding pokemons in the cells of a group of constraints. Returns the cells
+    with a dictionary from number of pokemons used to (number of ways, number
+    of ways each cell has a pokemon)
+
+    Cells are placed one at a time. After each cell only the pokemons counted
+    so far for constraints that have cells on both sides matter, so placements
+    agreeing on those counts are merged - forwards to count the ways of
+    reaching each count and backwards to count the ways of finishing from it
+
+    Parameters:
+        constraints (list<tuple<frozenset<int>, int>>): constraints of the group
+    """
+    cells = sorted({cell for constraint_cells, _ in constraints for cell in constraint_cells})
+    cells = _frontier_order(cells, constraints)
+    position = {cell: place for place, cell in enumerate(cells)}
+    cell_count = len(cells)
+    first = [min(position[cell] for cell in constraint_cells)
+             for constraint_cells, _ in constraints]
+    last = [max(position[cell] for cell in constraint_cells)
+            for constraint_cells, _ in constraints]
+    targets = [pokemon_num for _, pokemon_num in constraints]
+    if any(not 0 <= target <= len(constraint_cells)
+           for constraint_cells, target in constraints):
+        return cells, {}
+
+    # constraints left open after each number of cells placed, in state order
+    open_after = [[] for _ in range(cell_count + 1)]
+    by_cell = {}
+    for number, (constraint_cells, _) in enumerate(constraints):
+        for place in range(first[number] + 1, last[number] + 1):
+            open_after[place].append(number)
+        for cell in constraint_cells:
+            by_cell.setdefault(cell, []).append(number)
+    cells_left = [len(constraint_cells) for constraint_cells, _ in constraints]
+    steps = []
+    for place, cell in enumerate(cells):
+        # states are padded with a 0 for constraints starting at this cell
+        padding = len(open_after[place])
+        state_of = {number: spot for spot, number in enumerate(open_after[place])}
+        following_of = {number: spot for spot, number in enumerate(open_after[place + 1])}
+        # constraints without this cell keep their count, so only the ones
+        # with it are checked
+        closing, touched = [], []
+        for number in by_cell[cell]:
+            cells_left[number] -= 1
+            if last[number] == place:
+                closing.append((state_of.get(number, padding), targets[number]))
+            else:
+                touched.append((following_of[number], targets[number], cells_left[number]))
+        carry = _picker([state_of.get(number, padding) for number in open_after[place + 1]])
+        steps.append((closing, carry, touched))
+
+    # forward - ways of reaching each state after each cell, by pokemons used,
+    # with the ways the cell itself hides a pokemon kept apart as well
+    forward = [{(): {0: 1}}]
+    with_pokemon = []
+    edges = []
+    for closing, carry, touched in steps:
+        reached = {}
+        reached_with_pokemon = {}
+        cell_edges = []
+        for state, used_counts in forward[-1].items():
+            padded = state + (0,)
+            carried = carry(padded)
+            for has_pokemon in (0, 1):
+                following = _step(padded, carried, has_pokemon, closing, touched)
+                if following is None:
+                    continue
+                cell_edges.append((state, has_pokemon, following))
+                _add_shifted(reached.setdefault(following, {}), used_counts, has_pokemon)
+                if has_pokemon:
+                    _add_shifted(reached_with_pokemon.setdefault(following, {}), used_counts, 1)
+        forward.append(reached)
+        with_pokemon.append(reached_with_pokemon)
+        edges.append(cell_edges)
+
+    # backward - ways of finishing from each state, by pokemons used
+    backward = [None] * cell_count + [{(): {0: 1}}]
+    for place in range(cell_count - 1, -1, -1):
+        finishing = {}
+        for state, has_pokemon, following in edges[place]:
+            rest = backward[place + 1].get(following)
+            if rest is None:
+                continue
+            _add_shifted(finishing.setdefault(state, {}), rest, has_pokemon)
+        backward[place] = finishing
+
+    totals = backward[0].get((), {})
+    ways = {used: (count, [0] * cell_count) for used, count in totals.items()}
+    for place in range(cell_count):
+        for following, counts_before in with_pokemon[place].items():
+            rest = backward[place + 1].get(following)
+            if rest is None:
+                continue
+            for used_before, count_before in counts_before.items():
+                for used_after, count_after in rest.items():
+                    ways[used_before + used_after][1][place] += count_before * count_after
+    return cells, ways
+
+def _add_shifted(counts, added, shift):
+    """
+    Adds ways by pokemons used to counts, each with shift more pokemons used
+
+    Parameters:
+        counts (dict<int, int>): ways by pokemons used, added to
+        added (dict<int, int>): ways by pokemons used
+        shift (int): pokemons used on top of those of added
+    """
+    for used, count in added.items():
+        counts[used + shift] = counts.get(used + shift, 0) + count
+
+def _step(padded, carried, has_pokemon, closing, touched):
+    """
+    (tuple<int, ...>) Returns state after placing a cell, or None if the cell
+    breaks a constraint
+
+    Parameters:
+        padded (tuple<int, ...>): pokemons counted for each constraint open
+        before the cell, followed by a 0
+        carried (tuple<int, ...>): counts of padded for each constraint open
+        after the cell
+        has_pokemon (int): 1 if cell hides a pokemon, else 0
+        closing (list<tuple<int, int>>): (spot in padded, target) of
+        constraints whose last cell this is
+        touched (list<tuple<int, int, int>>): (spot in carried, target, cells
+        left) of the other constraints holding the cell
+    """
+    for spot, target in closing:
+        if padded[spot] + has_pokemon != target:
+            return None
+    if not touched:
+        return carried
+    following = list(carried)
+    for spot, target, remaining in touched:
+        value = following[spot] + has_pokemon
+        if value > target or value + remaining < target:
+            return None
+        following[spot] = value
+    return tuple(following)
+
+def _picker(spots):
+    """
+    (callable) Returns a function giving the values at spots of a tuple, as a tuple
+
+    Parameters:
+        spots (list<int>): spots picked
+    """
+    if len(spots) > 1:
+        return itemgetter(*spots)
+    return lambda values: tuple(values[spot] for spot in spots)
+
+def _frontier_order(cells, constraints):
+    """
+    (list<int>) Returns cells in the order a breadth first walk over shared
+    constraints reaches them, which keeps few constraints open at a time
+
+    Parameters:
+        cells (list<int>): cells of a group in increasing order
+        constraints (list<tuple<frozenset<int>, int>>): constraints of the group
+    """
+    by_cell = {}
+    for constraint_cells, _ in constraints:
+        for cell in constraint_cells:
+            by_cell.setdefault(cell, []).append(constraint_cells)
+    ordered = []
+    reached = set()
+    for start in cells:
+        if start in reached:
+            continue
+        reached.add(start)
+        queue = [start]
+        while queue:
+            cell = queue.pop(0)
+            ordered.append(cell)
+            for constraint_cells in by_cell[cell]:
+                for other in sorted(constraint_cells):
+                    if other not in reached:
+                        reached.add(other)
+                        queue.append(other)
+    return ordered
+
+def _components(constraints):
+    """
+    (list<list<tuple<frozenset<int>, int>>>) Splits constraints into groups that
+    share no cells
+
+    Parameters:
+        constraints (list<tuple<frozenset<int>, int>>): frontier constraints
+    """
+    by_cell = {}
+    for constraint in constraints:
+        for cell in constraint[0]:
+            by_cell.setdefault(cell, []).append(constraint)
+
+    seen = set()
+    groups = []
+    for constraint in constraints:
+        if constraint in seen:
+            continue
+        seen.add(constraint)
+        queue = [constraint]
+        group = []
+        while queue:
+            current = queue.pop()
+            group.append(current)
+            for cell in current[0]:
+                for other in by_cell[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        queue.append(other)
+        groups.append(group)
+    return groups
+
+def _convolve(first, second):
+    """
+    (dict<int, int>) Returns number of ways of two independent sets of cells
+    together, by total number of pokemons used
+
+    Parameters:
+        first (dict<int, int|tuple>): ways of first set by pokemons used
+        second (dict<int, int|tuple>): ways of second set by pokemons used -
+        values can be (ways, cell counts) as given by count_group
+    """
+    combined = {}
+    for used, count in first.items():
+        count = count[0] if isinstance(count, tuple) else count
+        for other_used, other_count in second.items():
+            other_count = other_count[0] if isinstance(other_count, tuple) else other_count
+            combined[used + other_used] = combined.get(used + other_used, 0) + count * other_count
+    return combined
+
+def _comb(size, chosen):
+    """
+    (int) Returns number of ways of choosing chosen cells out of size, which is
+    zero when chosen is out of range
+
+    Parameters:
+        size (int): number of cells
+        chosen (int): number of cells chosen
+    """
+    if chosen < 0 or chosen > size:
+        return 0
+    return math.comb(size, chosen)
+
+def benchmark(grid_size, num_pokemon, games, seed=0):
+    """
+    (dict) Plays games of one setting by always taking the hint (revealing
+    every safe cell, or the cell least likely to hide a pokemon) and returns
+    number of positions timed with the mean, 99th percentile and worst time
+    in milliseconds of answering a position from scratch and with the cache
+    kept between moves
+
+    Parameters:
+        grid_size (int): the size of the grid used
+        num_pokemon (int): number of hidden pokemon involved
+        games (int): number of games played
+        seed (int): seed of the first game - each game after uses the next seed
+    """
+    cold_times = []
+    warm_times = []
+    for game in range(games):
+        engine = PokemonEngine(grid_size, num_pokemon, safe_first_click=True,
+                               limit_pokeballs=False, seed=seed + game)
+        model = engine.get_model()
+        rng = random.Random(seed + game)
+        probability_engine = ProbabilityEngine()
+        middle = grid_size // 2
+        engine.reveal(middle*grid_size + middle)
+        while engine.status()["state"] == PLAYING:
+            start = perf_counter()
+            ProbabilityEngine().get_probabilities(model)
+            cold_times.append(perf_counter() - start)
+            start = perf_counter()
+            probabilities = probability_engine.get_probabilities(model)
+            warm_times.append(perf_counter() - start)
+
+            safe = [cell for cell, probability in probabilities.items() if probability == 0]
+            for cell in probabilities:
+                if probabilities[cell] == 1:
+                    engine.flag(cell)
+            if not safe:
+                best = min(probabilities.values())
+                safe = [rng.choice([cell for cell, probability in probabilities.items()
+                                    if probability == best])]
+            for cell in safe:
+                if engine.status()["state"] == PLAYING:
+                    engine.reveal(cell)
+
+    result = {"grid_size": grid_size, "num_pokemon": num_pokemon, "positions": len(cold_times)}
+    for name, times in (("cold", cold_times), ("cached", warm_times)):
+        times.sort()
+        result[name + "_mean"] = 1000 * sum(times) / len(times)
+        result[name + "_p99"] = 1000 * times[int(0.99 * (len(times) - 1))]
+        result[name + "_max"] = 1000 * times[-1]
+    return result
+
+def main():
+    """
+    Runs probability benchmark from the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks exact Pokemon probabilities")
+    parser.add_argument("settings", nargs="*", metavar="GRID_SIZE:NUM_POKEMON",
+                        help="settings to benchmark (default: 30:99 30:185)")
+    parser.add_argument("--games", type=int, default=20, help="games played per setting")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    arguments = parser.parse_args()
+
+    settings = DEFAULT_SETTINGS
+    if arguments.settings:
+        settings = [tuple(int(value) for value in setting.split(":"))
+                    for setting in arguments.settings]
+
+    print("grid_size num_pokemon positions  cold ms: mean   p99   max"
+          "  cached ms: mean   p99   max")
+    for grid_size, num_pokemon in settings:
+        result = benchmark(grid_size, num_pokemon, arguments.games, arguments.seed)
+        print("{grid_size:>9} {num_pokemon:>11} {positions:>9} {cold_mean:>15.2f} "
+              "{cold_p99:>5.2f} {cold_max:>5.2f} {cached_mean:>17.2f} {cached_p99:>5.2f} "
+              "{cached_max:>5.2f}".format(**result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+# Replays of A3 Pokemon Game - recorded games are played again move by move
+# and checked against the final state they were recorded with. Replays run
+# headless at full speed (across processes for large regression runs) or can
+# be watched in real time on a board view
+#
+# Run "python replay.py games.jsonl" to replay and verify a file of recordings
+
+import argparse
+import json
+
+from multiprocessing import Pool
+from time import perf_counter
+from board_model import UNEXPOSED
+from engine import PokemonEngine
+from journal import REVEAL_MOVE, FLAG_MOVE, CHORD_MOVE
+
+class GameRecorder(object):
+    """
+    Records the moves played on a PokemonEngine
+    """
+    def __init__(self, engine, seed=None):
+        """
+        Passes moves on to engine while keeping them, so the game can be
+        replayed later. Recorders can be played like an engine (for example by
+        PokemonSolver)
+
+        Parameters:
+            engine (PokemonEngine): engine of a game that has not been played yet
+            seed (int): seed engine's pokemon locations were made from - pokemon
+            locations are recorded instead if None
+        """
+        self._engine = engine
+        self._seed = seed
+        self._pokemon_locations = None
+        self._moves = []
+
+    def get_model(self):
+        """
+        (BoardModel) Returns board model of game recorded
+        """
+        return self._engine.get_model()
+
+    def status(self):
+        """
+        (dict) Returns status of game recorded (see PokemonEngine.status)
+        """
+        return self._engine.status()
+
+    def reveal(self, index):
+        """
+        (list<int>) Reveals cell at index and returns indexes of every cell that changed
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        return self._play(REVEAL_MOVE, index)
+
+    def flag(self, index):
+        """
+        (list<int>) Places or takes back a pokeball at index and returns
+        indexes of every cell that changed
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        return self._play(FLAG_MOVE, index)
+
+    def chord(self, index):
+        """
+        (list<int>) Reveals the neighbours of a revealed number with all its
+        pokeballs placed and returns indexes of every cell that changed
+
+        Parameters:
+            index (int): index corresponding to game string
+        """
+        return self._play(CHORD_MOVE, index)
+
+    def get_recording(self):
+        """
+        (dict) Returns recording of game so far - its settings, its seed or
+        pokemon locations, its moves and the state and game string it ended in
+        """
+        snapshot = self._engine.snapshot()
+        recording = {
+            "grid_size": snapshot["grid_size"],
+            "num_pokemon": snapshot["num_pokemon"],
+            "limit_pokeballs": self._engine.get_limit_pokeballs(),
+            "safe_first_click": self._engine.get_safe_first_click(),
+            "moves": list(self._moves),
+            "state": snapshot["state"],
+            "game": snapshot["game"]
+            }
+        if self._seed is not None:
+            recording["seed"] = self._seed
+        else:
+            recording["pokemon_locations"] = list(self._pokemon_locations
+                                                  or snapshot["pokemon_locations"])
+        return recording
+
+    def _play(self, move, index):
+        """
+        (list<int>) Plays and records a move
+
+        Parameters:
+            move (str): REVEAL_MOVE, FLAG_MOVE or CHORD_MOVE
+            index (int): index corresponding to game string
+        """
+        changed = apply_move(self._engine, move, index)
+        # pokemons are only placed by the first reveal when first clicks are safe
+        if self._pokemon_locations is None and self._engine.get_model().get_pokemon_locations():
+            self._pokemon_locations = self._engine.get_model().get_pokemon_locations()
+        self._moves.append((move, index))
+        return changed
+
+def start_replay(recording):
+    """
+    (PokemonEngine) Returns engine of a recorded game before any move is played
+
+    Parameters:
+        recording (dict): recording as given by GameRecorder.get_recording
+    """
+    if "seed" in recording:
+        return PokemonEngine(recording["grid_size"], recording["num_pokemon"],
+                             limit_pokeballs=recording["limit_pokeballs"],
+                             safe_first_click=recording["safe_first_click"],
+                             seed=recording["seed"])
+
+    # pokemons are put where they were recorded - the recorded first click
+    # was already safe so nothing has to be held back
+    engine = PokemonEngine(recording["grid_size"], 0,
+                           limit_pokeballs=recording["limit_pokeballs"])
+    pokemon_locations = tuple(recording["pokemon_locations"])
+    engine.load_game(len(pokemon_locations), pokemon_locations,
+                     UNEXPOSED*recording["grid_size"]**2, recording["grid_size"])
+    return engine
+
+def apply_move(engine, move, index):
+    """
+    (list<int>) Plays a move on engine and returns indexes of every cell that changed
+
+    Parameters:
+        engine (PokemonEngine): engine move is played on
+        move (str): REVEAL_MOVE, FLAG_MOVE or CHORD_MOVE
+        index (int): index corresponding to game string
+    """
+    if move == REVEAL_MOVE:
+        return engine.reveal(index)
+    if move == CHORD_MOVE:
+        return engine.chord(index)
+    return engine.flag(index)
+
+def replay(recording):
+    """
+    (PokemonEngine) Plays every move of a recording as fast as possible and
+    returns engine of the finished replay
+
+    Parameters:
+        recording (dict): recording as given by GameRecorder.get_recording
+    """
+    engine = start_replay(recording)
+    reveal, flag = engine.reveal, engine.flag
+    for move, index in recording["moves"]:
+        if move == REVEAL_MOVE:
+            reveal(index)
+        elif move == FLAG_MOVE:
+            flag(index)
+        else:
+            engine.chord(index)
+    return engine
+
+def verify(recording):
+    """
+    (bool) Returns True if replaying recording ends in the state and game
+    string it was recorded with
+
+    Parameters:
+        recording (dict): recording as given by GameRecorder.get_recording
+    """
+    engine = replay(recording)
+    return (engine.status()["state"] == recording["state"]
+            and engine.get_model().get_game() == recording["game"])
+
+def verify_all(recordings, processes=None, chunk_size=64):
+    """
+    (list<int>) Verifies many recordings, spread over processes, and returns
+    positions of the recordings that did not replay to their recorded state
+
+    Parameters:
+        recordings (list<dict>): recordings as given by GameRecorder.get_recording
+        processes (int): number of processes used, one per CPU if None and
+        none (replays run in this process) if 1
+        chunk_size (int): number of recordings sent to a process at a time
+    """
+    if processes == 1:
+        results = map(verify, recordings)
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(verify, recordings, chunk_size)
+    return [position for position, matched in enumerate(results) if not matched]
+
+def animate_replay(master, recording, delay=200, images=True, on_finish=None):
+    """
+    (BoardView) Replays a recording in real time on a board view packed in
+    master, playing one move every delay milliseconds, and returns the view
+
+    Parameters:
+        master (object): tkinter widget board view is packed in
+        recording (dict): recording as given by GameRecorder.get_recording
+        delay (int): milliseconds between moves
+        images (bool): True if cells show sprites instead of coloured boxes
+        on_finish (callable): called with True if the replay ended in the
+        recorded state (False otherwise) once every move is played
+    """
+    # the GUI is only needed (and imported) when replays are watched
+    from Minesweeper import (BoardView, ImageBoardView, VirtualBoardView,
+                             BOARD_WIDTH, MIN_ITEM_CELL_PIXELS)
+
+    engine = start_replay(recording)
+    model = engine.get_model()
+    grid_size = recording["grid_size"]
+    if BOARD_WIDTH / grid_size < MIN_ITEM_CELL_PIXELS:
+        view = VirtualBoardView(master, model, images=images)
+        view.draw_board()
+    else:
+        view = ImageBoardView(master, grid_size) if images else BoardView(master, grid_size)
+        view.draw_board(model.get_game())
+    view.pack()
+    moves = iter(recording["moves"])
+
+    def play_next():
+        move = next(moves, None)
+        if move is None:
+            if on_finish is not None:
+                on_finish(engine.status()["state"] == recording["state"]
+                          and engine.get_model().get_game() == recording["game"])
+            return
+        view.update_cells(engine.get_model(), apply_move(engine, *move))
+        master.after(delay, play_next)
+
+    master.after(delay, play_next)
+    return view
+
+def write_recordings(filename, recordings):
+    """
+    Writes recordings to a file, one JSON recording per line
+
+    Parameters:
+        filename (str): path of file written
+        recordings (iterable<dict>): recordings as given by GameRecorder.get_recording
+    """
+    with open(filename, "w", encoding="utf-8") as file:
+        for recording in recordings:
+            file.write(json.dumps(recording, ensure_ascii=False) + "\n")
+
+def read_recordings(filename):
+    """
+    (list<dict>) Returns recordings of a file written by write_recordings
+
+    Parameters:
+        filename (str): path of file read
+    """
+    with open(filename, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def main():
+    """
+    Replays and verifies a file of recordings from the command line
+    """
+    parser = argparse.ArgumentParser(description="Replays and verifies recorded Pokemon games")
+    parser.add_argument("recordings", help="file of recordings, one JSON recording per line")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="processes replays are spread over (default: one per CPU)")
+    arguments = parser.parse_args()
+
+    recordings = read_recordings(arguments.recordings)
+    start = perf_counter()
+    failed = verify_all(recordings, arguments.processes)
+    elapsed = perf_counter() - start
+    print("replayed {} games in {:.2f}s ({:.0f} games/s), {} did not match".format(
+        len(recordings), elapsed, len(recordings) / elapsed, len(failed)))
+    for position in failed:
+        print("recording", position + 1, "did not replay to its recorded state")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# Binary save files of A3 Pokemon Game - a compact, versioned alternative to
+# the text save files. Pokemons are kept as a bit per cell and cell states as
+# half a byte per cell, and files are read through mmap so large boards load
+# without building a game string
+#
+# Layout (little endian):
+#   header   - magic, version, reserved, grid size, number of pokemons,
+#              board width and elapsed time (see _HEADER)
+#   pokemons - one bit per cell, cell i is bit i % 8 of byte i // 8
+#   cells    - one cell code (see BoardModel.get_cell_codes) per half byte,
+#              even cells in the low half of each byte
+#   checksum - crc32 of everything before it
+
+import mmap
+import struct
+import zlib
+
+from board_model import POKEMON_CODE
+
+# CONSTANTS
+MAGIC = b"PKMN"
+VERSION = 1
+BINARY_EXTENSION = ".pkb"
+_HEADER = struct.Struct("<4sHHIIId")
+_CHECKSUM = struct.Struct("<I")
+# translation tables that move a value into or out of part of a byte
+_HIGH_HALF = bytes((byte << 4) & 0xff for byte in range(256))
+_LOW_NIBBLE = bytes(byte & 0xf for byte in range(256))
+_HIGH_NIBBLE = bytes(byte >> 4 for byte in range(256))
+_TO_BIT = tuple(bytes((byte << bit) & 0xff for byte in range(256)) for bit in range(8))
+_FROM_BIT = tuple(bytes((byte >> bit) & 1 for byte in range(256)) for bit in range(8))
+_CELL_CODES = bytes(range(POKEMON_CODE + 1))
+
+def write_binary_save(filename, model, elapsed_time, board_width):
+    """
+    Writes game of board model to a binary save file
+
+    Parameters:
+        filename (str): path of file written
+        model (BoardModel): board model of game saved
+        elapsed_time (float): how long user have been playing so far
+        board_width (int): width of game board
+    """
+    data = encode_binary_save(model.get_grid_size(), model.get_pokemon_locations(),
+                              model.get_cell_codes(), elapsed_time, board_width)
+    with open(filename, "wb") as file:
+        file.write(data)
+
+def encode_binary_save(grid_size, pokemon_locations, cell_codes, elapsed_time, board_width):
+    """
+    (bytes) Returns contents of a binary save file of a game. Takes a copy of
+    the game rather than a model so it can be called away from the thread the
+    model is played on
+
+    Parameters:
+        grid_size (int): the size of the grid used
+        pokemon_locations (tuple<int, ...>): indices of pokemon locations
+        cell_codes (bytes): cell codes as given by BoardModel.get_cell_codes
+        elapsed_time (float): how long user have been playing so far
+        board_width (int): width of game board
+    """
+    data = b"".join((
+        _HEADER.pack(MAGIC, VERSION, 0, grid_size, len(pokemon_locations),
+                     board_width, elapsed_time),
+        pack_bits(pokemon_locations, grid_size*grid_size),
+        pack_cell_codes(cell_codes)))
+    return data + _CHECKSUM.pack(zlib.crc32(data))
+
+def read_binary_save(filename):
+    """
+    (dict) Reads a binary save file through mmap and returns its settings with
+    the same keys as a text save file - Game_string holds cell codes instead of
+    a string. Raises ValueError if file is not a binary save file this version
+    can read or has been damaged
+
+    Parameters:
+        filename (str): path of file read
+    """
+    with open(filename, "rb") as file:
+        # mmap cannot map an empty file
+        if file.seek(0, 2) < _HEADER.size + _CHECKSUM.size:
+            raise ValueError("file is too short to be a binary save file")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, _, grid_size, num_pokemon, board_width, elapsed_time = \
+                _HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("file is not a binary save file")
+            if version != VERSION:
+                raise ValueError("binary save file version " + str(version)
+                                 + " cannot be read, only version " + str(VERSION))
+
+            cell_count = grid_size*grid_size
+            pokemons_start = _HEADER.size
+            cells_start = pokemons_start + (cell_count + 7) // 8
+            cells_end = cells_start + (cell_count + 1) // 2
+            if len(data) != cells_end + _CHECKSUM.size:
+                raise ValueError("binary save file has the wrong size for its grid size")
+            checksum, = _CHECKSUM.unpack_from(data, cells_end)
+            if zlib.crc32(memoryview(data)[:cells_end]) != checksum:
+                raise ValueError("binary save file is damaged - checksum does not match")
+
+            pokemon_locations = unpack_bits(data[pokemons_start:cells_start], cell_count)
+            cell_codes = unpack_cell_codes(data[cells_start:cells_end], cell_count)
+
+    if len(pokemon_locations) != num_pokemon:
+        raise ValueError("binary save file has the wrong number of pokemons")
+    if cell_codes.translate(None, _CELL_CODES):
+        raise ValueError("binary save file has unknown cell states")
+    return {"Game_string": cell_codes, "Pokemon_locations": pokemon_locations,
+            "Grid_size": grid_size, "Elapsed_time": elapsed_time,
+            "Board_width": board_width}
+
+def pack_bits(indexes, count):
+    """
+    (bytes) Returns a bit per cell for count cells with the bits of indexes set
+
+    Parameters:
+        indexes (iterable<int>): cells whose bits are set
+        count (int): number of cells
+    """
+    padded = (count + 7) // 8 * 8
+    cells = bytearray(padded)
+    for index in indexes:
+        cells[index] = 1
+    # every eighth cell lands in the same bit - the bits are combined as big
+    # ints since no byte can carry into the next
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(cells[bit::8].translate(_TO_BIT[bit]), "little")
+    return packed.to_bytes(padded // 8, "little")
+
+def unpack_bits(data, count):
+    """
+    (tuple<int, ...>) Returns indexes of the cells whose bits are set
+
+    Parameters:
+        data (bytes): a bit per cell as made by pack_bits
+        count (int): number of cells
+    """
+    cells = bytearray(len(data) * 8)
+    for bit in range(8):
+        cells[bit::8] = data.translate(_FROM_BIT[bit])
+    del cells[count:]
+
+    indexes = []
+    index = cells.find(1)
+    while index != -1:
+        indexes.append(index)
+        index = cells.find(1, index + 1)
+    return tuple(indexes)
+
+def pack_cell_codes(cell_codes):
+    """
+    (bytes) Returns cell codes packed two to a byte
+
+    Parameters:
+        cell_codes (bytes): one cell code per cell
+    """
+    if len(cell_codes) % 2:
+        cell_codes += bytes(1)
+    high = int.from_bytes(cell_codes[1::2].translate(_HIGH_HALF), "little")
+    low = int.from_bytes(cell_codes[0::2], "little")
+    return (high | low).to_bytes(len(cell_codes) // 2, "little")
+
+def unpack_cell_codes(data, count):
+    """
+    (bytes) Returns one cell code per cell from codes packed two to a byte
+
+    Parameters:
+        data (bytes): cell codes as packed by pack_cell_codes
+        count (int): number of cells
+    """
+    cell_codes = bytearray(len(data) * 2)
+    cell_codes[0::2] = data.translate(_LOW_NIBBLE)
+    cell_codes[1::2] = data.translate(_HIGH_NIBBLE)
+    return bytes(cell_codes[:count])
@@ -0,0 +1,535 @@
+# Game server of A3 Pokemon Game - hosts many games (sessions) in one process
+# on an asyncio event loop. Clients on localhost drive their sessions with one
+# JSON request per line and get one JSON reply per line, in order
+#
+# Requests ("id" is optional and sent back with the reply):
+#   {"op": "new", "grid_size": 10, "num_pokemon": 15} - starts a session
+#   {"op": "new", "session": s}     - new pokemon locations (PokemonGame.new_game)
+#   {"op": "restart", "session": s} - same pokemon locations (PokemonGame.restart_game)
+#   {"op": "load", "session": s, "grid_size": n, "pokemon_locations": [...],
+#    "game": "~~1..."}              - saved game (PokemonGame.restart_with_load)
+#   {"op": "reveal", "session": s, "index": i}
+#   {"op": "flag", "session": s, "index": i}
+#   {"op": "chord", "session": s, "index": i} - neighbours of a revealed number
+#   {"op": "status", "session": s}
+#   {"op": "close", "session": s}
+# Replies carry "ok" and either "error" or the session, its status and the
+# cells that changed as [index, cell] pairs ("game" instead when the whole
+# board was replaced)
+#
+# Run "python server.py" to serve, "python server.py --benchmark" to measure
+# move latency or "python server.py --memory" to measure memory per session
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import tracemalloc
+
+from collections import OrderedDict
+from time import monotonic, perf_counter
+from board_model import REVEALED, UNEXPOSED, FLAG
+from engine import PokemonEngine
+
+# CONSTANTS
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 100000
+# seconds a session can go without a request before it is closed
+IDLE_TIMEOUT = 600.0
+SERVER_MAX_GRID_SIZE = 100
+# longest request line read - longer ones close the connection
+MAX_REQUEST_BYTES = 64 * 1024
+# bytes of replies a slow client can leave unread before requests from it are
+# no longer read
+WRITE_BUFFER_LIMIT = 256 * 1024
+_LOADABLE_CELLS = frozenset(REVEALED + UNEXPOSED + FLAG)
+
+class Session(object):
+    """
+    A game hosted by the server
+    """
+    __slots__ = ("engine", "last_used")
+
+    def __init__(self, engine, last_used):
+        """
+        Parameters:
+            engine (PokemonEngine): game played in session
+            last_used (float): monotonic time of the last request
+        """
+        self.engine = engine
+        self.last_used = last_used
+
+class GameServer(object):
+    """
+    Serves many Pokemon games over JSON lines
+    """
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT,
+                 max_grid_size=SERVER_MAX_GRID_SIZE, safe_first_click=True,
+                 limit_pokeballs=True):
+        """
+        Sessions are kept in order of use so idle ones are found at the front
+        without going through every session. Requests are answered straight
+        away on the event loop - no game move ever waits on another
+
+        Parameters:
+            max_sessions (int): most sessions open at once
+            idle_timeout (float): seconds before an unused session is closed
+            max_grid_size (int): largest grid size a session can be started with
+            safe_first_click (bool): first cell revealed never has a pokemon in
+            or around it
+            limit_pokeballs (bool): True if no more pokeballs can be placed
+            than there are pokemons in game
+        """
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout
+        self._max_grid_size = max_grid_size
+        self._safe_first_click = safe_first_click
+        self._limit_pokeballs = limit_pokeballs
+        self._sessions = OrderedDict()
+        self._operations = {
+            "new": self._new,
+            "restart": self._restart,
+            "load": self._load,
+            "reveal": self._reveal,
+            "flag": self._flag,
+            "chord": self._chord,
+            "status": self._status,
+            "close": self._close
+            }
+
+    def get_num_sessions(self):
+        """
+        (int) Returns number of sessions open
+        """
+        return len(self._sessions)
+
+    def handle_request(self, request):
+        """
+        (dict) Plays a request on its session and returns the reply
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            op = request.get("op")
+            # ops that are not strings (lists, objects) cannot be looked up
+            operation = self._operations.get(op) if isinstance(op, str) else None
+            if operation is None:
+                raise ValueError("unknown op: " + repr(op))
+            reply = operation(request)
+        except ValueError as error:
+            reply = {"ok": False, "error": str(error)}
+        if isinstance(request, dict) and "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    def handle_line(self, line):
+        """
+        (bytes) Answers one request line with one reply line
+
+        Parameters:
+            line (bytes): JSON request ending in a newline
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            reply = {"ok": False, "error": "request is not valid JSON"}
+        else:
+            reply = self.handle_request(request)
+        return json.dumps(reply, separators=(",", ":")).encode() + b"\n"
+
+    def evict_idle(self, now=None):
+        """
+        (int) Closes sessions that have been idle longer than idle timeout and
+        returns how many were closed
+
+        Parameters:
+            now (float): monotonic time to measure idleness from, now if None
+        """
+        if now is None:
+            now = monotonic()
+        evicted = 0
+        # least recently used sessions are at the front
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used < self._idle_timeout:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+        return evicted
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Serves clients until cancelled, closing idle sessions as it goes
+
+        Parameters:
+            host (str): address listened on
+            port (int): port listened on, any free port if 0
+        """
+        server = await self.start(host, port)
+        eviction = asyncio.create_task(self._evict_idle_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction.cancel()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        (asyncio.Server) Starts listening for clients and returns the server.
+        Idle sessions are only closed by serve (or by calling evict_idle)
+
+        Parameters:
+            host (str): address listened on
+            port (int): port listened on, any free port if 0
+        """
+        return await asyncio.start_server(self._handle_client, host, port,
+                                          limit=MAX_REQUEST_BYTES)
+
+    async def _evict_idle_forever(self):
+        """
+        Closes idle sessions a few times per idle timeout
+        """
+        while True:
+            await asyncio.sleep(self._idle_timeout / 4)
+            self.evict_idle()
+
+    async def _handle_client(self, reader, writer):
+        """
+        Answers requests of one connection in order until it is closed. Once
+        replies pile up unread past WRITE_BUFFER_LIMIT no more requests are
+        read from it, so a client that sends faster than it reads is held
+        back by TCP instead of filling memory
+
+        Parameters:
+            reader (asyncio.StreamReader): requests from client
+            writer (asyncio.StreamWriter): replies to client
+        """
+        transport = writer.transport
+        transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"ok":false,"error":"request line is too long"}\n')
+                    break
+                if not line:
+                    break
+                writer.write(self.handle_line(line))
+                if transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _session(self, request):
+        """
+        (Session) Returns session named in request and marks it as used
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session_id = request.get("session")
+        session = self._sessions.get(session_id) if isinstance(session_id, str) else None
+        if session is None:
+            raise ValueError("no such session: " + repr(session_id))
+        session.last_used = monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _new(self, request):
+        """
+        (dict) Starts a session, or a new game in a session keeping its settings
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        if "session" in request:
+            session_id = request["session"]
+            session = self._session(request)
+            session.engine.new_game()
+            return self._board_reply(session_id, session.engine)
+
+        grid_size = _integer(request, "grid_size", 2, self._max_grid_size)
+        num_pokemon = _integer(request, "num_pokemon", 0, grid_size*grid_size - 1)
+        if len(self._sessions) >= self._max_sessions and not self.evict_idle():
+            raise ValueError("server is full - try again later")
+        engine = PokemonEngine(grid_size, num_pokemon, limit_pokeballs=self._limit_pokeballs,
+                               safe_first_click=self._safe_first_click)
+        session_id = secrets.token_urlsafe(12)
+        self._sessions[session_id] = Session(engine, monotonic())
+        return self._board_reply(session_id, engine)
+
+    def _restart(self, request):
+        """
+        (dict) Restarts game of a session with the same pokemon locations
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session = self._session(request)
+        session.engine.restart_game()
+        return self._board_reply(request["session"], session.engine)
+
+    def _load(self, request):
+        """
+        (dict) Continues a saved game in a session
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session = self._session(request)
+        grid_size = _integer(request, "grid_size", 2, self._max_grid_size)
+        cell_count = grid_size*grid_size
+        game = request.get("game")
+        if not isinstance(game, str) or len(game) != cell_count:
+            raise ValueError("game must be a string of grid_size^2 cells")
+        if not _LOADABLE_CELLS.issuperset(game):
+            raise ValueError("game has unknown cells")
+        pokemon_locations = request.get("pokemon_locations")
+        if (not isinstance(pokemon_locations, list)
+                or not all(type(index) is int and 0 <= index < cell_count
+                           for index in pokemon_locations)
+                or len(set(pokemon_locations)) != len(pokemon_locations)
+                or len(pokemon_locations) >= cell_count):
+            raise ValueError("pokemon_locations must be different indexes of cells")
+        session.engine.load_game(len(pokemon_locations), tuple(pokemon_locations),
+                                 game, grid_size)
+        return self._board_reply(request["session"], session.engine)
+
+    def _reveal(self, request):
+        """
+        (dict) Reveals a cell of a session's game
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session = self._session(request)
+        index = _integer(request, "index", 0, session.engine.get_model().get_grid_size()**2 - 1)
+        return self._move_reply(request["session"], session.engine,
+                                session.engine.reveal(index))
+
+    def _flag(self, request):
+        """
+        (dict) Places or takes back a pokeball in a session's game
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session = self._session(request)
+        index = _integer(request, "index", 0, session.engine.get_model().get_grid_size()**2 - 1)
+        return self._move_reply(request["session"], session.engine,
+                                session.engine.flag(index))
+
+    def _chord(self, request):
+        """
+        (dict) Reveals the neighbours of a revealed number in a session's game
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session = self._session(request)
+        index = _integer(request, "index", 0, session.engine.get_model().get_grid_size()**2 - 1)
+        return self._move_reply(request["session"], session.engine,
+                                session.engine.chord(index))
+
+    def _status(self, request):
+        """
+        (dict) Returns whole board and status of a session's game
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        session = self._session(request)
+        return self._board_reply(request["session"], session.engine)
+
+    def _close(self, request):
+        """
+        (dict) Closes a session
+
+        Parameters:
+            request (dict): request decoded from a line sent by a client
+        """
+        self._session(request)
+        del self._sessions[request["session"]]
+        return {"ok": True, "session": request["session"]}
+
+    def _board_reply(self, session_id, engine):
+        """
+        (dict) Returns reply with status and whole board of a game
+
+        Parameters:
+            session_id (str): session of game
+            engine (PokemonEngine): game replied about
+        """
+        reply = engine.status()
+        reply["ok"] = True
+        reply["session"] = session_id
+        reply["game"] = engine.get_model().get_game()
+        return reply
+
+    def _move_reply(self, session_id, engine, changed):
+        """
+        (dict) Returns reply with status and changed cells of a game
+
+        Parameters:
+            session_id (str): session of game
+            engine (PokemonEngine): game replied about
+            changed (list<int>): indexes of cells changed by move
+        """
+        get_cell = engine.get_model().get_cell
+        reply = engine.status()
+        reply["ok"] = True
+        reply["session"] = session_id
+        reply["changed"] = [[index, get_cell(index)] for index in changed]
+        return reply
+
+def _integer(request, key, low, high):
+    """
+    (int) Returns integer of request at key, raising ValueError if it is missing
+    or not between low and high (inclusive)
+
+    Parameters:
+        request (dict): request decoded from a line sent by a client
+        key (str): key of integer
+        low (int): smallest value allowed
+        high (int): largest value allowed
+    """
+    value = request.get(key)
+    if type(value) is not int or not low <= value <= high:
+        raise ValueError("{} must be an integer between {} and {}".format(key, low, high))
+    return value
+
+async def _benchmark(sessions, requests, grid_size, num_pokemon, seed):
+    """
+    (dict) Measures a server started on a free port - see benchmark
+    """
+    server_games = GameServer()
+    server = await server_games.start(DEFAULT_HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection(DEFAULT_HOST, port)
+    rng = random.Random(seed)
+
+    async def ask(request):
+        writer.write(json.dumps(request).encode() + b"\n")
+        return json.loads(await reader.readline())
+
+    session_ids = []
+    for _ in range(sessions):
+        reply = await ask({"op": "new", "grid_size": grid_size, "num_pokemon": num_pokemon})
+        session_ids.append(reply["session"])
+
+    latencies = []
+    handle_line = server_games.handle_line
+    for _ in range(requests):
+        request = {"op": "reveal" if rng.random() < 0.8 else "flag",
+                   "session": rng.choice(session_ids),
+                   "index": rng.randrange(grid_size*grid_size)}
+        line = json.dumps(request).encode() + b"\n"
+        start = perf_counter()
+        reply = json.loads(handle_line(line))
+        latencies.append(perf_counter() - start)
+        if reply.get("state") != "playing":
+            await ask({"op": "new", "session": request["session"]})
+
+    start = perf_counter()
+    for _ in range(requests):
+        await ask({"op": "status", "session": rng.choice(session_ids)})
+    round_trip = (perf_counter() - start) / requests
+
+    writer.close()
+    await writer.wait_closed()
+    server.close()
+    await server.wait_closed()
+    latencies.sort()
+    return {"sessions": server_games.get_num_sessions(), "requests": requests,
+            "p50_ms": latencies[len(latencies) // 2] * 1000,
+            "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+            "round_trip_ms": round_trip * 1000}
+
+def benchmark(sessions=10000, requests=100000, grid_size=16, num_pokemon=40, seed=0):
+    """
+    (dict) Opens sessions on a local server and returns how long moves on
+    random sessions take to answer - p50 and p99 of the time spent answering
+    a move (from request line to reply line) and the average round trip of a
+    request over a connection
+
+    Parameters:
+        sessions (int): number of sessions opened
+        requests (int): number of moves timed
+        grid_size (int): the size of the grid of every session
+        num_pokemon (int): number of hidden pokemon of every session
+        seed (int): seed of the moves made
+    """
+    return asyncio.run(_benchmark(sessions, requests, grid_size, num_pokemon, seed))
+
+def memory_benchmark(grid_sizes=(10, 100, 1000), density=0.15, seed=0):
+    """
+    (dict<int, int>) Returns bytes a session takes for each grid size - measured
+    with tracemalloc over sessions that have had a first cell revealed
+
+    Parameters:
+        grid_sizes (tuple<int, ...>): grid sizes measured
+        density (float): share of cells hiding a pokemon
+        seed (int): seed of the first session's pokemon locations
+    """
+    results = {}
+    for grid_size in grid_sizes:
+        # enough sessions for about a million cells, and at least two
+        sessions = max(2, min(10000, 10**6 // grid_size**2))
+        games = GameServer(max_grid_size=grid_size)
+        request = {"op": "new", "grid_size": grid_size,
+                   "num_pokemon": int(grid_size*grid_size*density)}
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for session in range(sessions):
+            session_id = games.handle_request(request)["session"]
+            engine = games._sessions[session_id].engine
+            # boards are placed on the first reveal - give it a seed instead
+            engine.new_game(seed=seed + session)
+            engine.reveal(grid_size*grid_size // 2)
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        results[grid_size] = used // sessions
+    return results
+
+def main():
+    """
+    Runs game server (or its benchmark) from the command line
+    """
+    parser = argparse.ArgumentParser(description="Hosts Pokemon games over JSON lines")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address listened on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port listened on")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS,
+                        help="most sessions open at once")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="seconds before an unused session is closed")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="measure move latency with 10000 sessions instead of serving")
+    parser.add_argument("--memory", action="store_true",
+                        help="measure bytes per session instead of serving")
+    arguments = parser.parse_args()
+
+    if arguments.memory:
+        for grid_size, used in memory_benchmark().items():
+            print("{0}x{0}: {1} bytes per session".format(grid_size, used))
+        return
+    if arguments.benchmark:
+        print("sessions {sessions}  requests {requests}  p50 {p50_ms:.3f}ms  "
+              "p99 {p99_ms:.3f}ms  round trip {round_trip_ms:.3f}ms".format(**benchmark()))
+        return
+    games = GameServer(arguments.max_sessions, arguments.idle_timeout)
+    print("serving Pokemon games on {}:{}".format(arguments.host, arguments.port))
+    try:
+        asyncio.run(games.serve(arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+# Auto solver of A3 Pokemon Game - plays headless games to the end using only
+# what a player can see, and benchmarks how fast and how often it wins
+#
+# Run "python solver.py" for the default benchmark or for example
+# "python solver.py 9:10 16:40 --games 500" for chosen grid_size:num_pokemon
+
+import argparse
+import random
+
+from time import perf_counter
+from board_model import FLAG, UNEXPOSED, REVEALED, neighbour_table
+from engine import PokemonEngine, PLAYING, WON
+from probability import ProbabilityEngine
+
+# CONSTANTS
+DEFAULT_SETTINGS = ((9, 10), (16, 40), (30, 99))
+
+class PokemonSolver(object):
+    """
+    Plays a PokemonEngine game to the end
+    """
+    def __init__(self, engine, rng=None):
+        """
+        Finds pokemons with single cell rules, subset rules and exact
+        enumeration of the numbered frontier, and only guesses (by lowest
+        chance of a pokemon) when nothing is certain
+
+        Parameters:
+            engine (PokemonEngine): game that will be played
+            rng (random.Random): random number generator used to break ties
+            between equally good guesses
+        """
+        self._engine = engine
+        self._rng = rng if rng is not None else random.Random()
+        self._model = engine.get_model()
+        self._grid_size = self._model.get_grid_size()
+        self._cell_edges, self._edge_offsets = neighbour_table(self._grid_size)
+        # numbered cells that still have unexposed neighbours
+        self._frontier = set()
+        self._guesses = 0
+        self._probability_engine = ProbabilityEngine()
+
+    def get_guesses(self):
+        """
+        (int) Returns number of cells revealed without being certain they are safe
+        """
+        return self._guesses
+
+    def solve(self):
+        """
+        (str) Plays game until it is won or lost and returns final state
+        """
+        game = self._model.get_game()
+        self._frontier.update(index for index, cell in enumerate(game) if cell in REVEALED)
+        if not self._frontier and FLAG not in game:
+            # nothing revealed yet - start in the middle of the board
+            middle = self._grid_size // 2
+            self._reveal(middle*self._grid_size + middle, guess=True)
+
+        while self._engine.status()["state"] == PLAYING:
+            safe, pokemons = self.certain_moves()
+            if not safe and not pokemons:
+                self._reveal(self.best_guess(), guess=True)
+                continue
+            for index in pokemons:
+                if self._model.get_cell(index) == UNEXPOSED:
+                    self._engine.flag(index)
+            for index in safe:
+                if self._engine.status()["state"] == PLAYING:
+                    self._reveal(index)
+        return self._engine.status()["state"]
+
+    def certain_moves(self):
+        """
+        (tuple<set<int>, set<int>>) Returns cells that are certainly safe and
+        cells that certainly hide a pokemon, trying cheaper rules first
+        """
+        constraints = self._constraints()
+        safe, pokemons = set(), set()
+
+        # single cell rules
+        for cells, pokemon_num in constraints:
+            if pokemon_num == 0:
+                safe.update(cells)
+            elif pokemon_num == len(cells):
+                pokemons.update(cells)
+        if safe or pokemons:
+            return safe, pokemons
+
+        # a cell set inside another tells us about the cells in one but not the other
+        by_cell = {}
+        for constraint in constraints:
+            for cell in constraint[0]:
+                by_cell.setdefault(cell, []).append(constraint)
+        for cells, pokemon_num in constraints:
+            for other_cells, other_num in by_cell[next(iter(cells))]:
+                if len(other_cells) > len(cells) and cells < other_cells:
+                    extra_cells = other_cells - cells
+                    if other_num == pokemon_num:
+                        safe.update(extra_cells)
+                    elif other_num - pokemon_num == len(extra_cells):
+                        pokemons.update(extra_cells)
+        if safe or pokemons:
+            return safe, pokemons
+
+        # every cell left is accounted for by the number of pokemons left
+        unexposed = self._unexposed_cells()
+        pokemons_left = self._model.get_num_pokemon() - self._model.get_num_attempted_catches()
+        if pokemons_left == 0:
+            return set(unexposed), pokemons
+        if pokemons_left == len(unexposed):
+            return safe, set(unexposed)
+
+        probabilities, _ = self.probabilities(constraints, unexposed, pokemons_left)
+        for cell, probability in probabilities.items():
+            if probability == 0:
+                safe.add(cell)
+            elif probability == 1:
+                pokemons.add(cell)
+        return safe, pokemons
+
+    def best_guess(self):
+        """
+        (int) Returns an unexposed cell with the lowest chance of hiding a pokemon
+        """
+        unexposed = self._unexposed_cells()
+        pokemons_left = self._model.get_num_pokemon() - self._model.get_num_attempted_catches()
+        probabilities, interior_probability = self.probabilities(self._constraints(), unexposed,
+                                                                 pokemons_left)
+        interior = [cell for cell in unexposed if cell not in probabilities]
+        best = min(probabilities.values(), default=1.0)
+        if interior and interior_probability <= best:
+            return self._rng.choice(interior)
+        return self._rng.choice([cell for cell, probability in probabilities.items()
+                                 if probability == best])
+
+    def probabilities(self, constraints, unexposed, pokemons_left):
+        """
+        (tuple<dict<int, float>, float>) Returns the exact chance of a pokemon
+        for every frontier cell together with the chance of a pokemon in any
+        interior cell (see ProbabilityEngine.frontier_probabilities)
+
+        Parameters:
+            constraints (list<tuple<frozenset<int>, int>>): cells around each
+            numbered cell and the pokemons still hidden among them
+            unexposed (list<int>): every unexposed cell on board
+            pokemons_left (int): number of pokemons without a pokeball on them
+        """
+        return self._probability_engine.frontier_probabilities(constraints, unexposed,
+                                                               pokemons_left)
+
+    def _reveal(self, index, guess=False):
+        """
+        Reveals a cell and adds newly numbered cells to the frontier
+
+        Parameters:
+            index (int): index corresponding to game string
+            guess (bool): True if cell was not certainly safe
+        """
+        if guess:
+            self._guesses += 1
+        for cell in self._engine.reveal(index):
+            if self._model.get_cell(cell) in REVEALED:
+                self._frontier.add(cell)
+
+    def _constraints(self):
+        """
+        (list<tuple<frozenset<int>, int>>) Returns the unexposed cells around each
+        frontier cell and how many pokemons are still hidden among them.
+        Frontier cells with no unexposed neighbours are dropped
+        """
+        constraints = []
+        for index in list(self._frontier):
+            cells = []
+            flagged = 0
+            for offset in self._edge_offsets[self._cell_edges[index]]:
+                neighbour = self._model.get_cell(index + offset)
+                if neighbour == UNEXPOSED:
+                    cells.append(index + offset)
+                elif neighbour == FLAG:
+                    flagged += 1
+            if cells:
+                constraints.append((frozenset(cells), int(self._model.get_cell(index)) - flagged))
+            else:
+                self._frontier.discard(index)
+        return constraints
+
+    def _unexposed_cells(self):
+        """
+        (list<int>) Returns every unexposed cell on board
+        """
+        game = self._model.get_game()
+        return [index for index, cell in enumerate(game) if cell == UNEXPOSED]
+
+def benchmark(grid_size, num_pokemon, games, seed=0, safe_first_click=True):
+    """
+    (dict) Solves games of one setting and returns number of games, wins,
+    win rate, average guesses and games solved per second
+
+    Parameters:
+        grid_size (int): the size of the grid used
+        num_pokemon (int): number of hidden pokemon involved
+        games (int): number of games played
+        seed (int): seed of the first game - each game after uses the next seed
+        safe_first_click (bool): first cell revealed never has a pokemon around it
+    """
+    wins = 0
+    guesses = 0
+    start = perf_counter()
+    for game in range(games):
+        engine = PokemonEngine(grid_size, num_pokemon, safe_first_click=safe_first_click,
+                               seed=seed + game)
+        solver = PokemonSolver(engine, random.Random(seed + game))
+        wins += solver.solve() == WON
+        guesses += solver.get_guesses()
+    elapsed = perf_counter() - start
+    return {"grid_size": grid_size, "num_pokemon": num_pokemon, "games": games,
+            "wins": wins, "win_rate": wins / games, "guesses": guesses / games,
+            "games_per_second": games / elapsed}
+
+def main():
+    """
+    Runs solver benchmark from the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the Pokemon auto solver")
+    parser.add_argument("settings", nargs="*", metavar="GRID_SIZE:NUM_POKEMON",
+                        help="settings to benchmark (default: 9:10 16:40 30:99)")
+    parser.add_argument("--games", type=int, default=200, help="games played per setting")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--unsafe-first-click", action="store_true",
+                        help="allow first cell revealed to hide a pokemon")
+    arguments = parser.parse_args()
+
+    settings = DEFAULT_SETTINGS
+    if arguments.settings:
+        settings = [tuple(int(value) for value in setting.split(":"))
+                    for setting in arguments.settings]
+
+    print("grid_size num_pokemon  games  win_rate  guesses  games/s")
+    for grid_size, num_pokemon in settings:
+        result = benchmark(grid_size, num_pokemon, arguments.games, arguments.seed,
+                           not arguments.unsafe_first_click)
+        print("{grid_size:>9} {num_pokemon:>11} {games:>6} {win_rate:>9.1%} "
+              "{guesses:>8.2f} {games_per_second:>8.1f}".format(**result))
+
+if __name__ == "__main__":
+    main()